@@ -5,24 +5,225 @@ Provides REST API endpoints for React frontend
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+import copy
+import json
 import sys
+import threading
+import time
 import os
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from model.optimizer_linear import LinearDataCenterOptimizer
 from model.data_interface import DataInterface
 from data.supabase_interface import SupabaseInterface
-from data.api.store_to_postgres import connect_db
+from data.api.store_to_postgres import get_conn
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
-# Initialize interfaces
+# Initialize interfaces; share the data interface's Supabase connection
+# rather than opening a second one
 data_interface = DataInterface(use_supabase=True)
-supabase = SupabaseInterface()
+supabase = data_interface.supabase or SupabaseInterface()
+
+
+# Background queries that can overlap with work on the request thread
+_executor = ThreadPoolExecutor(max_workers=4)
+
+# Historical aggregates change at most daily; cache them briefly per process.
+# The cached readers raise on database errors, so lru_cache never stores a
+# fallback and the endpoint answers 500 instead of serving zeros for the window
+CACHE_TTL_SECONDS = 300
+
+
+# Run history changes with every optimization, so it is only cached briefly
+HISTORY_CACHE_TTL_SECONDS = 60
+
+
+def _ttl_bucket(ttl=CACHE_TTL_SECONDS):
+    """Current cache window; lru_cache entries keyed on it expire after ttl seconds."""
+    return int(time.monotonic() // ttl)
+
+
+@lru_cache(maxsize=16)
+def _optimization_history(limit, _bucket):
+    """JSON-ready optimization history records (cached per TTL window)."""
+    history_df = supabase.get_optimization_history(limit=limit, raise_errors=True)
+    if history_df.empty:
+        return []
+    # Convert timestamps to strings column-wise, before building records
+    if 'run_timestamp' in history_df:
+        history_df['run_timestamp'] = history_df['run_timestamp'].astype(str)
+    return history_df.to_dict('records')
+
+
+@lru_cache(maxsize=16)
+def _period_summary(days, _bucket):
+    """Period summary for the last `days` days (cached per TTL window)."""
+    return supabase.get_period_summary(days, raise_errors=True)
+
+
+@lru_cache(maxsize=16)
+def _monthly_breakdown(months, _bucket):
+    """JSON-ready monthly breakdown records (cached per TTL window)."""
+    breakdown_df = supabase.get_monthly_breakdown(months, raise_errors=True)
+    if breakdown_df.empty:
+        return []
+    # Convert timestamps to strings column-wise, before building records
+    if 'month' in breakdown_df:
+        breakdown_df['month'] = breakdown_df['month'].astype(str)
+    return breakdown_df.to_dict('records')
+
+
+@lru_cache(maxsize=16)
+def _daily_trends(days, _bucket):
+    """JSON-ready daily trends (cached per TTL window)."""
+    trends = supabase.get_daily_trends(days, raise_errors=True)
+    # Convert dates to strings
+    if 'dates' in trends:
+        trends['dates'] = [str(d) for d in trends['dates']]
+    return trends
+
+
+def _database_counts():
+    """Arizona interchange record count and optimization run count, in one round-trip."""
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM eia_interchange
+                     WHERE fromba IN ('AZPS', 'SRP', 'TEPC') OR toba IN ('AZPS', 'SRP', 'TEPC')),
+                    (SELECT COUNT(*) FROM optimization_summary)
+            """)
+            return cur.fetchone()
+
+
+@lru_cache(maxsize=8)
+def _get_optimizer(capacity_mw):
+    """Return a long-lived (optimizer, lock) per capacity; hold the lock while solving.
+
+    Reruns reuse the built model and resolved solver, and the module's data interface.
+    """
+    # Imported on first solve so the data-only endpoints don't load pyomo
+    from model.optimizer_linear import LinearDataCenterOptimizer
+
+    optimizer = LinearDataCenterOptimizer(
+        use_supabase=True, capacity_mw=capacity_mw, data_interface=data_interface
+    )
+    return optimizer, threading.Lock()
+
+
+@lru_cache(maxsize=64)
+def _run_demo_optimization(date_str, capacity_mw):
+    """Solve the demo-data model once per (date, capacity); repeat requests hit the cache.
+
+    Callers must not mutate the returned dict; copy it first.
+    """
+    from model.optimizer_linear import LinearDataCenterOptimizer
+
+    optimizer = LinearDataCenterOptimizer(use_supabase=False, capacity_mw=capacity_mw)
+    opt_data = data_interface.prepare_optimization_data(
+        date=date_str,
+        use_supabase=False
+    )
+    temperatures, prices, _ = data_interface.export_to_model_format(opt_data)
+    optimizer.build_model(temperatures, prices)
+    return optimizer.solve(solver_name='highs')
+
+
+# Real-data results per (date, capacity); a date's inputs don't change within
+# the hour, and each solve would also write another run to Supabase
+OPTIMIZE_CACHE_TTL_SECONDS = 3600
+OPTIMIZE_CACHE_MAX_ENTRIES = 64
+_optimization_cache = {}
+_optimization_cache_lock = threading.Lock()
+
+# On-disk copy of the same results so a server restart doesn't re-solve
+RESULTS_CACHE_DIR = os.path.expanduser("~/.cache/cooling-cloud/daily")
+
+
+def _results_cache_path(date_str, capacity_mw):
+    return os.path.join(RESULTS_CACHE_DIR, f"{date_str}_{capacity_mw}MW.json")
+
+
+def _load_cached_results(path):
+    """Return results stored at path if younger than the TTL, else None."""
+    try:
+        if time.time() - os.path.getmtime(path) > OPTIMIZE_CACHE_TTL_SECONDS:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _json_ready(results):
+    """Results as jsonify would send them, so cached and fresh responses match."""
+    return json.loads(app.json.dumps(results))
+
+
+def _save_cached_results(path, results):
+    """Write JSON-ready results atomically; a failed write only costs a future re-solve."""
+    try:
+        os.makedirs(RESULTS_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(results, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not write results cache {path}: {e}")
+
+
+def _remember_results(key, results):
+    """Keep results in memory for the TTL, dropping expired then oldest entries when full."""
+    now = time.monotonic()
+    with _optimization_cache_lock:
+        for stale in [k for k, (expires, _) in _optimization_cache.items() if expires <= now]:
+            del _optimization_cache[stale]
+        while len(_optimization_cache) >= OPTIMIZE_CACHE_MAX_ENTRIES:
+            del _optimization_cache[next(iter(_optimization_cache))]
+        _optimization_cache[key] = (now + OPTIMIZE_CACHE_TTL_SECONDS, results)
+
+
+def _run_supabase_optimization(target_date, capacity_mw):
+    """Fetch, solve and save one day, reusing a result from the last hour (memory, then disk).
+
+    Callers must not mutate the returned dict; copy it first.
+    """
+    key = (target_date.strftime('%Y-%m-%d'), capacity_mw)
+    cached = _optimization_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    path = _results_cache_path(*key)
+    results = _load_cached_results(path)
+    if results is None:
+        # Reuse the optimizer for this capacity across requests
+        optimizer, lock = _get_optimizer(capacity_mw)
+        with lock:
+            results = optimizer.optimize_with_supabase(date=target_date, solver_name='highs')
+        if results:
+            results = _json_ready(results)
+            _save_cached_results(path, results)
+            # The solve saved a new run; don't serve a history without it
+            _optimization_history.cache_clear()
+
+    if results:
+        _remember_results(key, results)
+    return results
+
+
+def _conditional_json(payload):
+    """JSON response with an ETag; a matching If-None-Match gets an empty 304."""
+    response = jsonify(payload)
+    response.add_etag()
+    # Let clients keep the body but revalidate it on every request
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 @app.route('/api/health', methods=['GET'])
@@ -43,6 +244,9 @@ def run_optimization():
         date_str = data.get('date', datetime.now().strftime('%Y-%m-%d'))
         use_real_data = data.get('use_real_data', True)
         capacity_mw = data.get('capacity_mw', 2000)  # Default 2000MW for Arizona
+        # Quantize to whole MW so 2000, 2000.0, "2000" and sub-MW slider
+        # jitter share one solve in the memory, disk and demo caches
+        capacity_mw = int(round(float(capacity_mw)))
 
         print(f"📊 Running optimization with capacity: {capacity_mw}MW, date: {date_str}")
 
@@ -52,27 +256,16 @@ def run_optimization():
         else:
             target_date = datetime.now()
 
-        # Initialize optimizer with custom capacity
-        print(f"🔧 Initializing optimizer with {capacity_mw}MW capacity...")
-        optimizer = LinearDataCenterOptimizer(
-            use_supabase=use_real_data,
-            capacity_mw=capacity_mw
-        )
-
         if use_real_data:
-            # Use real data from Supabase
+            # Use real data from Supabase (memoized per date and capacity for an hour)
             print("📡 Fetching real data from Supabase...")
-            results = optimizer.optimize_with_supabase(date=target_date, solver_name='highs')
+            results = copy.deepcopy(_run_supabase_optimization(target_date, capacity_mw))
         else:
-            # Use demo data
+            # Use demo data (memoized per date and capacity)
             print("📊 Using demo data...")
-            opt_data = data_interface.prepare_optimization_data(
-                date=target_date,
-                use_supabase=False
+            results = copy.deepcopy(
+                _run_demo_optimization(target_date.strftime('%Y-%m-%d'), capacity_mw)
             )
-            temperatures, prices, _ = data_interface.export_to_model_format(opt_data)
-            model = optimizer.build_model(temperatures, prices)
-            results = optimizer.solve(solver_name='highs')
 
         if results:
             # Add metadata
@@ -118,24 +311,12 @@ def get_history():
     """Get optimization history."""
     try:
         limit = request.args.get('limit', 10, type=int)
-        history_df = supabase.get_optimization_history(limit=limit)
-
-        if not history_df.empty:
-            history = history_df.to_dict('records')
-            # Convert timestamps to strings
-            for record in history:
-                if 'run_timestamp' in record:
-                    record['run_timestamp'] = str(record['run_timestamp'])
+        history = _optimization_history(limit, _ttl_bucket(HISTORY_CACHE_TTL_SECONDS))
 
-            return jsonify({
-                'success': True,
-                'history': history
-            })
-        else:
-            return jsonify({
-                'success': True,
-                'history': []
-            })
+        return jsonify({
+            'success': True,
+            'history': history
+        })
 
     except Exception as e:
         return jsonify({
@@ -149,9 +330,9 @@ def get_period_summary():
     """Get period summary statistics."""
     try:
         days = request.args.get('days', 30, type=int)
-        summary = supabase.get_period_summary(days)
+        summary = _period_summary(days, _ttl_bucket())
 
-        return jsonify({
+        return _conditional_json({
             'success': True,
             'summary': summary
         })
@@ -168,24 +349,12 @@ def get_monthly_breakdown():
     """Get monthly breakdown."""
     try:
         months = request.args.get('months', 6, type=int)
-        breakdown_df = supabase.get_monthly_breakdown(months)
+        breakdown = _monthly_breakdown(months, _ttl_bucket())
 
-        if not breakdown_df.empty:
-            breakdown = breakdown_df.to_dict('records')
-            # Convert timestamps to strings
-            for record in breakdown:
-                if 'month' in record:
-                    record['month'] = str(record['month'])
-
-            return jsonify({
-                'success': True,
-                'breakdown': breakdown
-            })
-        else:
-            return jsonify({
-                'success': True,
-                'breakdown': []
-            })
+        return _conditional_json({
+            'success': True,
+            'breakdown': breakdown
+        })
 
     except Exception as e:
         return jsonify({
@@ -199,13 +368,9 @@ def get_daily_trends():
     """Get daily trends data."""
     try:
         days = request.args.get('days', 30, type=int)
-        trends = supabase.get_daily_trends(days)
-
-        # Convert dates to strings
-        if 'dates' in trends:
-            trends['dates'] = [str(d) for d in trends['dates']]
+        trends = _daily_trends(days, _ttl_bucket())
 
-        return jsonify({
+        return _conditional_json({
             'success': True,
             'trends': trends
         })
@@ -225,9 +390,7 @@ def get_real_time_data():
         target_date = datetime.strptime(date_str, '%Y-%m-%d')
 
         # Get weather and price data
-        temperatures = supabase.fetch_weather_data(target_date, hours=24)
-        prices = supabase.get_electricity_prices(target_date, hours=24)
-        water_prices = supabase.get_water_prices(target_date)
+        temperatures, prices, water_prices = supabase.fetch_daily_bundle(target_date, hours=24)
 
         return jsonify({
             'success': True,
@@ -257,24 +420,16 @@ def get_real_time_data():
 def get_stats():
     """Get overall system statistics."""
     try:
-        # Get various statistics
-        last_30_days = supabase.get_period_summary(30)
-        last_year = supabase.get_period_summary(365)
-
-        # Get database stats
-        conn = connect_db()
-        cur = conn.cursor()
-
-        # Count total records
-        cur.execute("SELECT COUNT(*) FROM eia_interchange WHERE fromba IN ('AZPS', 'SRP', 'TEPC') OR toba IN ('AZPS', 'SRP', 'TEPC')")
-        total_records = cur.fetchone()[0]
+        # Database counts run on a pooled connection while the period
+        # summaries are looked up here
+        counts = _executor.submit(_database_counts)
 
-        # Count optimization runs
-        cur.execute("SELECT COUNT(*) FROM optimization_summary")
-        total_runs = cur.fetchone()[0]
+        # Get various statistics
+        bucket = _ttl_bucket()
+        last_30_days = _period_summary(30, bucket)
+        last_year = _period_summary(365, bucket)
 
-        cur.close()
-        conn.close()
+        total_records, total_runs = counts.result()
 
         return jsonify({
             'success': True,
@@ -296,7 +451,21 @@ def get_stats():
 
 
 if __name__ == '__main__':
+    # Localhost only by default; set API_HOST=0.0.0.0 to expose the API on the network
+    host = os.getenv('API_HOST', '127.0.0.1')
+
     print("🚀 Starting Cooling The Cloud API Server...")
-    print("📡 API running at http://localhost:5000")
+    print(f"📡 API running at http://{host}:5000")
     print("🔗 Connect React app to this API")
-    app.run(debug=True, port=5000)
\ No newline at end of file
+
+    # Set DEV_RELOAD=1 to get the Flask debugger and auto-reloader back
+    if os.getenv('DEV_RELOAD') == '1':
+        app.run(debug=True, host=host, port=5000)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("⚠️ waitress not installed, falling back to threaded Flask server")
+            app.run(host=host, port=5000, threaded=True)
+        else:
+            serve(app, host=host, port=5000, threads=os.cpu_count() or 4)
@@ -1,10 +1,189 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, memo } from 'react';
 import { LineChart, Line, BarChart, Bar, AreaChart, Area, PieChart, Pie, Cell, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import { format } from 'date-fns';
 import { motion } from 'framer-motion';
 import { FaBolt, FaWater, FaLeaf, FaChartLine, FaPlay, FaCalendarAlt, FaDatabase } from 'react-icons/fa';
 import { optimizationService } from '../services/api';
 
+const customTooltipStyle = {
+  backgroundColor: 'rgba(15, 23, 42, 0.95)',
+  border: '1px solid rgba(96, 165, 250, 0.3)',
+  borderRadius: '8px',
+  padding: '8px 12px',
+};
+
+const CustomTooltip = ({ active, payload, label }) => {
+  if (active && payload && payload.length) {
+    return (
+      <div style={customTooltipStyle}>
+        <p className="text-white/80 text-sm">{`Hour ${label}`}</p>
+        {payload.map((entry, index) => (
+          <p key={index} className="text-sm" style={{ color: entry.color }}>
+            {`${entry.name}: ${entry.value.toFixed(2)}`}
+          </p>
+        ))}
+      </div>
+    );
+  }
+  return null;
+};
+
+// Memoized so editing the date or data source doesn't redraw the charts
+const HourlyCharts = memo(({ hourlyData }) => (
+  <div className="grid grid-cols-1 lg:grid-cols-2 gap-6 mb-8">
+    {/* Hourly Load Chart */}
+    <motion.div
+      initial={{ opacity: 0, y: 20 }}
+      animate={{ opacity: 1, y: 0 }}
+      transition={{ delay: 0.3 }}
+      className="glass-effect-dark border border-white/10 rounded-xl p-6"
+    >
+      <h3 className="text-lg font-semibold text-white mb-4">Hourly Load Profile</h3>
+      <ResponsiveContainer width="100%" height={250}>
+        <AreaChart data={hourlyData}>
+          <defs>
+            <linearGradient id="colorLoad" x1="0" y1="0" x2="0" y2="1">
+              <stop offset="5%" stopColor="#60A5FA" stopOpacity={0.8}/>
+              <stop offset="95%" stopColor="#60A5FA" stopOpacity={0.1}/>
+            </linearGradient>
+          </defs>
+          <CartesianGrid strokeDasharray="3 3" stroke="rgba(255,255,255,0.1)" />
+          <XAxis dataKey="hour" stroke="rgba(255,255,255,0.5)" />
+          <YAxis stroke="rgba(255,255,255,0.5)" />
+          <Tooltip content={<CustomTooltip />} />
+          <Area
+            type="monotone"
+            dataKey="batch_load_mw"
+            stroke="#60A5FA"
+            fillOpacity={1}
+            fill="url(#colorLoad)"
+            strokeWidth={2}
+          />
+        </AreaChart>
+      </ResponsiveContainer>
+    </motion.div>
+
+    {/* Temperature & Price */}
+    <motion.div
+      initial={{ opacity: 0, y: 20 }}
+      animate={{ opacity: 1, y: 0 }}
+      transition={{ delay: 0.4 }}
+      className="glass-effect-dark border border-white/10 rounded-xl p-6"
+    >
+      <h3 className="text-lg font-semibold text-white mb-4">Temperature & Price Trends</h3>
+      <ResponsiveContainer width="100%" height={250}>
+        <LineChart data={hourlyData}>
+          <CartesianGrid strokeDasharray="3 3" stroke="rgba(255,255,255,0.1)" />
+          <XAxis dataKey="hour" stroke="rgba(255,255,255,0.5)" />
+          <YAxis stroke="rgba(255,255,255,0.5)" />
+          <Tooltip content={<CustomTooltip />} />
+          <Line
+            type="monotone"
+            dataKey="temperature_f"
+            stroke="#FBBF24"
+            name="Temperature (°F)"
+            strokeWidth={2}
+            dot={false}
+          />
+          <Line
+            type="monotone"
+            dataKey="electricity_price"
+            stroke="#A78BFA"
+            name="Price ($/MWh)"
+            strokeWidth={2}
+            dot={false}
+          />
+        </LineChart>
+      </ResponsiveContainer>
+    </motion.div>
+  </div>
+));
+
+// Memoized with the charts so editing the date or data source doesn't
+// re-render (and re-animate) the result cards
+const ResultsPanel = memo(({ results }) => (
+  <>
+    {/* Summary Cards */}
+    <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-8">
+      <motion.div
+        initial={{ opacity: 0, scale: 0.9 }}
+        animate={{ opacity: 1, scale: 1 }}
+        className="glass-effect-dark border border-white/10 rounded-xl p-6"
+      >
+        <h3 className="text-lg font-semibold text-white mb-4 flex items-center">
+          <div className="w-2 h-2 bg-primary-400 rounded-full mr-3 animate-pulse" />
+          Cost Analysis
+        </h3>
+        <div className="space-y-3">
+          {[
+            { label: 'Total Cost', value: `$${results.summary.total_cost.toFixed(2)}`, color: 'text-white' },
+            { label: 'Electricity', value: `$${results.summary.electricity_cost.toFixed(2)}`, color: 'text-blue-400' },
+            { label: 'Water', value: `$${results.summary.water_cost.toFixed(2)}`, color: 'text-cyan-400' },
+            { label: 'Peak Demand', value: `${results.summary.peak_demand_mw.toFixed(1)} MW`, color: 'text-yellow-400' },
+          ].map((item) => (
+            <div key={item.label} className="flex justify-between items-center">
+              <span className="text-white/60 text-sm">{item.label}</span>
+              <span className={`font-semibold ${item.color}`}>{item.value}</span>
+            </div>
+          ))}
+        </div>
+      </motion.div>
+
+      <motion.div
+        initial={{ opacity: 0, scale: 0.9 }}
+        animate={{ opacity: 1, scale: 1 }}
+        transition={{ delay: 0.1 }}
+        className="glass-effect-dark border border-white/10 rounded-xl p-6"
+      >
+        <h3 className="text-lg font-semibold text-white mb-4 flex items-center">
+          <div className="w-2 h-2 bg-green-400 rounded-full mr-3 animate-pulse" />
+          Savings Impact
+        </h3>
+        <div className="space-y-3">
+          {[
+            { label: 'Daily Savings', value: `$${results.savings.daily_savings.toFixed(2)}`, accent: true },
+            { label: 'Annual Projection', value: `$${results.savings.annual_savings.toFixed(0)}`, accent: true },
+            { label: 'Efficiency Gain', value: `${results.savings.percentage_saved.toFixed(1)}%`, accent: true },
+          ].map((item) => (
+            <div key={item.label} className="flex justify-between items-center">
+              <span className="text-white/60 text-sm">{item.label}</span>
+              <span className={`font-semibold ${item.accent ? 'text-green-400' : 'text-white'}`}>
+                {item.value}
+              </span>
+            </div>
+          ))}
+        </div>
+      </motion.div>
+
+      <motion.div
+        initial={{ opacity: 0, scale: 0.9 }}
+        animate={{ opacity: 1, scale: 1 }}
+        transition={{ delay: 0.2 }}
+        className="glass-effect-dark border border-white/10 rounded-xl p-6"
+      >
+        <h3 className="text-lg font-semibold text-white mb-4 flex items-center">
+          <div className="w-2 h-2 bg-emerald-400 rounded-full mr-3 animate-pulse" />
+          Environmental
+        </h3>
+        <div className="space-y-3">
+          {[
+            { label: 'Water Saved', value: `${results.environmental.water_saved_gallons.toLocaleString()} gal`, color: 'text-blue-400' },
+            { label: 'CO₂ Avoided', value: `${results.environmental.carbon_avoided_tons.toFixed(2)} tons`, color: 'text-emerald-400' },
+            { label: 'Peak Reduction', value: `${results.environmental.peak_reduction_mw.toFixed(1)} MW`, color: 'text-orange-400' },
+          ].map((item) => (
+            <div key={item.label} className="flex justify-between items-center">
+              <span className="text-white/60 text-sm">{item.label}</span>
+              <span className={`font-semibold ${item.color}`}>{item.value}</span>
+            </div>
+          ))}
+        </div>
+      </motion.div>
+    </div>
+
+    <HourlyCharts hourlyData={results.hourly_data} />
+  </>
+));
+
 const Dashboard = () => {
   const [loading, setLoading] = useState(false);
   const [optimizationResults, setOptimizationResults] = useState(null);
@@ -58,29 +237,6 @@ const Dashboard = () => {
     warning: '#FBBF24',
   };
 
-  const customTooltipStyle = {
-    backgroundColor: 'rgba(15, 23, 42, 0.95)',
-    border: '1px solid rgba(96, 165, 250, 0.3)',
-    borderRadius: '8px',
-    padding: '8px 12px',
-  };
-
-  const CustomTooltip = ({ active, payload, label }) => {
-    if (active && payload && payload.length) {
-      return (
-        <div style={customTooltipStyle}>
-          <p className="text-white/80 text-sm">{`Hour ${label}`}</p>
-          {payload.map((entry, index) => (
-            <p key={index} className="text-sm" style={{ color: entry.color }}>
-              {`${entry.name}: ${entry.value.toFixed(2)}`}
-            </p>
-          ))}
-        </div>
-      );
-    }
-    return null;
-  };
-
   return (
     <div className="min-h-screen p-6">
       <div className="max-w-7xl mx-auto">
@@ -220,156 +376,7 @@ const Dashboard = () => {
         </motion.div>
 
         {/* Results Section */}
-        {optimizationResults && (
-          <>
-            {/* Summary Cards */}
-            <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-8">
-              <motion.div
-                initial={{ opacity: 0, scale: 0.9 }}
-                animate={{ opacity: 1, scale: 1 }}
-                className="glass-effect-dark border border-white/10 rounded-xl p-6"
-              >
-                <h3 className="text-lg font-semibold text-white mb-4 flex items-center">
-                  <div className="w-2 h-2 bg-primary-400 rounded-full mr-3 animate-pulse" />
-                  Cost Analysis
-                </h3>
-                <div className="space-y-3">
-                  {[
-                    { label: 'Total Cost', value: `$${optimizationResults.summary.total_cost.toFixed(2)}`, color: 'text-white' },
-                    { label: 'Electricity', value: `$${optimizationResults.summary.electricity_cost.toFixed(2)}`, color: 'text-blue-400' },
-                    { label: 'Water', value: `$${optimizationResults.summary.water_cost.toFixed(2)}`, color: 'text-cyan-400' },
-                    { label: 'Peak Demand', value: `${optimizationResults.summary.peak_demand_mw.toFixed(1)} MW`, color: 'text-yellow-400' },
-                  ].map((item) => (
-                    <div key={item.label} className="flex justify-between items-center">
-                      <span className="text-white/60 text-sm">{item.label}</span>
-                      <span className={`font-semibold ${item.color}`}>{item.value}</span>
-                    </div>
-                  ))}
-                </div>
-              </motion.div>
-
-              <motion.div
-                initial={{ opacity: 0, scale: 0.9 }}
-                animate={{ opacity: 1, scale: 1 }}
-                transition={{ delay: 0.1 }}
-                className="glass-effect-dark border border-white/10 rounded-xl p-6"
-              >
-                <h3 className="text-lg font-semibold text-white mb-4 flex items-center">
-                  <div className="w-2 h-2 bg-green-400 rounded-full mr-3 animate-pulse" />
-                  Savings Impact
-                </h3>
-                <div className="space-y-3">
-                  {[
-                    { label: 'Daily Savings', value: `$${optimizationResults.savings.daily_savings.toFixed(2)}`, accent: true },
-                    { label: 'Annual Projection', value: `$${optimizationResults.savings.annual_savings.toFixed(0)}`, accent: true },
-                    { label: 'Efficiency Gain', value: `${optimizationResults.savings.percentage_saved.toFixed(1)}%`, accent: true },
-                  ].map((item) => (
-                    <div key={item.label} className="flex justify-between items-center">
-                      <span className="text-white/60 text-sm">{item.label}</span>
-                      <span className={`font-semibold ${item.accent ? 'text-green-400' : 'text-white'}`}>
-                        {item.value}
-                      </span>
-                    </div>
-                  ))}
-                </div>
-              </motion.div>
-
-              <motion.div
-                initial={{ opacity: 0, scale: 0.9 }}
-                animate={{ opacity: 1, scale: 1 }}
-                transition={{ delay: 0.2 }}
-                className="glass-effect-dark border border-white/10 rounded-xl p-6"
-              >
-                <h3 className="text-lg font-semibold text-white mb-4 flex items-center">
-                  <div className="w-2 h-2 bg-emerald-400 rounded-full mr-3 animate-pulse" />
-                  Environmental
-                </h3>
-                <div className="space-y-3">
-                  {[
-                    { label: 'Water Saved', value: `${optimizationResults.environmental.water_saved_gallons.toLocaleString()} gal`, color: 'text-blue-400' },
-                    { label: 'CO₂ Avoided', value: `${optimizationResults.environmental.carbon_avoided_tons.toFixed(2)} tons`, color: 'text-emerald-400' },
-                    { label: 'Peak Reduction', value: `${optimizationResults.environmental.peak_reduction_mw.toFixed(1)} MW`, color: 'text-orange-400' },
-                  ].map((item) => (
-                    <div key={item.label} className="flex justify-between items-center">
-                      <span className="text-white/60 text-sm">{item.label}</span>
-                      <span className={`font-semibold ${item.color}`}>{item.value}</span>
-                    </div>
-                  ))}
-                </div>
-              </motion.div>
-            </div>
-
-            {/* Charts */}
-            <div className="grid grid-cols-1 lg:grid-cols-2 gap-6 mb-8">
-              {/* Hourly Load Chart */}
-              <motion.div
-                initial={{ opacity: 0, y: 20 }}
-                animate={{ opacity: 1, y: 0 }}
-                transition={{ delay: 0.3 }}
-                className="glass-effect-dark border border-white/10 rounded-xl p-6"
-              >
-                <h3 className="text-lg font-semibold text-white mb-4">Hourly Load Profile</h3>
-                <ResponsiveContainer width="100%" height={250}>
-                  <AreaChart data={optimizationResults.hourly_data}>
-                    <defs>
-                      <linearGradient id="colorLoad" x1="0" y1="0" x2="0" y2="1">
-                        <stop offset="5%" stopColor="#60A5FA" stopOpacity={0.8}/>
-                        <stop offset="95%" stopColor="#60A5FA" stopOpacity={0.1}/>
-                      </linearGradient>
-                    </defs>
-                    <CartesianGrid strokeDasharray="3 3" stroke="rgba(255,255,255,0.1)" />
-                    <XAxis dataKey="hour" stroke="rgba(255,255,255,0.5)" />
-                    <YAxis stroke="rgba(255,255,255,0.5)" />
-                    <Tooltip content={<CustomTooltip />} />
-                    <Area
-                      type="monotone"
-                      dataKey="batch_load_mw"
-                      stroke="#60A5FA"
-                      fillOpacity={1}
-                      fill="url(#colorLoad)"
-                      strokeWidth={2}
-                    />
-                  </AreaChart>
-                </ResponsiveContainer>
-              </motion.div>
-
-              {/* Temperature & Price */}
-              <motion.div
-                initial={{ opacity: 0, y: 20 }}
-                animate={{ opacity: 1, y: 0 }}
-                transition={{ delay: 0.4 }}
-                className="glass-effect-dark border border-white/10 rounded-xl p-6"
-              >
-                <h3 className="text-lg font-semibold text-white mb-4">Temperature & Price Trends</h3>
-                <ResponsiveContainer width="100%" height={250}>
-                  <LineChart data={optimizationResults.hourly_data}>
-                    <CartesianGrid strokeDasharray="3 3" stroke="rgba(255,255,255,0.1)" />
-                    <XAxis dataKey="hour" stroke="rgba(255,255,255,0.5)" />
-                    <YAxis stroke="rgba(255,255,255,0.5)" />
-                    <Tooltip content={<CustomTooltip />} />
-                    <Line
-                      type="monotone"
-                      dataKey="temperature_f"
-                      stroke="#FBBF24"
-                      name="Temperature (°F)"
-                      strokeWidth={2}
-                      dot={false}
-                    />
-                    <Line
-                      type="monotone"
-                      dataKey="electricity_price"
-                      stroke="#A78BFA"
-                      name="Price ($/MWh)"
-                      strokeWidth={2}
-                      dot={false}
-                    />
-                  </LineChart>
-                </ResponsiveContainer>
-              </motion.div>
-            </div>
-
-          </>
-        )}
+        {optimizationResults && <ResultsPanel results={optimizationResults} />}
       </div>
     </div>
   );
@@ -1,9 +1,76 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, memo } from 'react';
 import { format } from 'date-fns';
 import { motion } from 'framer-motion';
 import { FaHistory, FaEye, FaTimes } from 'react-icons/fa';
 import { optimizationService } from '../services/api';
 
+const getStatusColor = (status) => {
+  switch (status) {
+    case 'completed':
+    case 'optimal':
+      return 'text-green-400 bg-green-500/20';
+    case 'failed':
+      return 'text-red-400 bg-red-500/20';
+    case 'running':
+      return 'text-yellow-400 bg-yellow-500/20';
+    default:
+      return 'text-gray-400 bg-gray-500/20';
+  }
+};
+
+// Memoized on the fetched rows; onSelect is a state setter, so it is stable
+const HistoryRows = memo(({ history, onSelect }) => (
+  <tbody className="divide-y divide-primary-400/10">
+    {history.map((run, index) => (
+      <motion.tr
+        key={run.run_id}
+        initial={{ opacity: 0, x: -20 }}
+        animate={{ opacity: 1, x: 0 }}
+        transition={{ delay: index * 0.05 }}
+        className="hover:bg-primary-400/5 transition-colors"
+      >
+        <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-300">
+          {run.run_timestamp
+            ? format(new Date(run.run_timestamp), 'MMM dd, yyyy HH:mm')
+            : 'N/A'}
+        </td>
+        <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-300">
+          {run.run_name || 'Optimization Run'}
+        </td>
+        <td className="px-6 py-4 whitespace-nowrap">
+          <span className={`px-2 inline-flex text-xs leading-5 font-semibold rounded-full ${getStatusColor(run.optimization_status)}`}>
+            {run.optimization_status || 'unknown'}
+          </span>
+        </td>
+        <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-300">
+          ${run.total_cost?.toFixed(2) || '0.00'}
+        </td>
+        <td className="px-6 py-4 whitespace-nowrap text-sm text-green-400 font-medium">
+          ${run.cost_savings?.toFixed(2) || '0.00'}
+        </td>
+        <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-300">
+          {run.cost_savings_percent?.toFixed(1) || '0.0'}%
+        </td>
+        <td className="px-6 py-4 whitespace-nowrap text-sm text-blue-400">
+          {run.total_water_usage_gallons?.toLocaleString() || '0'} gal
+        </td>
+        <td className="px-6 py-4 whitespace-nowrap text-sm text-emerald-400">
+          {run.carbon_avoided_tons?.toFixed(2) || '0.00'} tons
+        </td>
+        <td className="px-6 py-4 whitespace-nowrap text-sm font-medium">
+          <button
+            onClick={() => onSelect(run)}
+            className="text-primary-400 hover:text-primary-300 flex items-center space-x-1 transition-colors"
+          >
+            <FaEye className="w-4 h-4" />
+            <span>View</span>
+          </button>
+        </td>
+      </motion.tr>
+    ))}
+  </tbody>
+));
+
 const History = () => {
   const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -28,20 +95,6 @@ const History = () => {
     }
   };
 
-  const getStatusColor = (status) => {
-    switch (status) {
-      case 'completed':
-      case 'optimal':
-        return 'text-green-400 bg-green-500/20';
-      case 'failed':
-        return 'text-red-400 bg-red-500/20';
-      case 'running':
-        return 'text-yellow-400 bg-yellow-500/20';
-      default:
-        return 'text-gray-400 bg-gray-500/20';
-    }
-  };
-
   return (
     <div className="min-h-screen p-6">
       <div className="max-w-7xl mx-auto">
@@ -127,55 +180,8 @@ const History = () => {
                     </th>
                   </tr>
                 </thead>
-                <tbody className="divide-y divide-primary-400/10">
-                  {history.map((run, index) => (
-                    <motion.tr
-                      key={run.run_id}
-                      initial={{ opacity: 0, x: -20 }}
-                      animate={{ opacity: 1, x: 0 }}
-                      transition={{ delay: index * 0.05 }}
-                      className="hover:bg-primary-400/5 transition-colors"
-                    >
-                      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-300">
-                        {run.run_timestamp
-                          ? format(new Date(run.run_timestamp), 'MMM dd, yyyy HH:mm')
-                          : 'N/A'}
-                      </td>
-                      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-300">
-                        {run.run_name || 'Optimization Run'}
-                      </td>
-                      <td className="px-6 py-4 whitespace-nowrap">
-                        <span className={`px-2 inline-flex text-xs leading-5 font-semibold rounded-full ${getStatusColor(run.optimization_status)}`}>
-                          {run.optimization_status || 'unknown'}
-                        </span>
-                      </td>
-                      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-300">
-                        ${run.total_cost?.toFixed(2) || '0.00'}
-                      </td>
-                      <td className="px-6 py-4 whitespace-nowrap text-sm text-green-400 font-medium">
-                        ${run.cost_savings?.toFixed(2) || '0.00'}
-                      </td>
-                      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-300">
-                        {run.cost_savings_percent?.toFixed(1) || '0.0'}%
-                      </td>
-                      <td className="px-6 py-4 whitespace-nowrap text-sm text-blue-400">
-                        {run.total_water_usage_gallons?.toLocaleString() || '0'} gal
-                      </td>
-                      <td className="px-6 py-4 whitespace-nowrap text-sm text-emerald-400">
-                        {run.carbon_avoided_tons?.toFixed(2) || '0.00'} tons
-                      </td>
-                      <td className="px-6 py-4 whitespace-nowrap text-sm font-medium">
-                        <button
-                          onClick={() => setSelectedRun(run)}
-                          className="text-primary-400 hover:text-primary-300 flex items-center space-x-1 transition-colors"
-                        >
-                          <FaEye className="w-4 h-4" />
-                          <span>View</span>
-                        </button>
-                      </td>
-                    </motion.tr>
-                  ))}
-                </tbody>
+                {/* Rows don't re-render when the detail modal opens or closes */}
+                <HistoryRows history={history} onSelect={setSelectedRun} />
               </table>
             </div>
           )}
@@ -1,10 +1,123 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo, memo } from 'react';
 import { LineChart, Line, AreaChart, Area, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts';
 import { format } from 'date-fns';
 import { motion } from 'framer-motion';
 import { FaWifi, FaSun, FaBolt, FaChartLine, FaSyncAlt, FaThermometerHalf, FaDollarSign } from 'react-icons/fa';
 import { optimizationService } from '../services/api';
 
+const customTooltipStyle = {
+  backgroundColor: 'rgba(15, 23, 42, 0.95)',
+  border: '1px solid rgba(96, 165, 250, 0.3)',
+  borderRadius: '8px',
+  padding: '8px 12px',
+};
+
+const CustomTooltip = ({ active, payload, label }) => {
+  if (active && payload && payload.length) {
+    return (
+      <div style={customTooltipStyle}>
+        <p className="text-gray-300 text-sm font-medium">Hour {label}</p>
+        {payload.map((entry, index) => (
+          <p key={index} className="text-sm" style={{ color: entry.color }}>
+            {entry.name}: {entry.dataKey === 'temperature'
+              ? `${entry.value.toFixed(1)}°F`
+              : `$${entry.value.toFixed(2)}/MWh`}
+          </p>
+        ))}
+      </div>
+    );
+  }
+  return null;
+};
+
+// Memoized so loading/refresh toggles and date edits don't re-render the
+// four KPI cards; they update once per new metadata object
+const CurrentConditions = memo(({ metadata }) => (
+  <div className="grid grid-cols-1 md:grid-cols-4 gap-4 mb-6">
+    <motion.div
+      initial={{ opacity: 0, scale: 0.95 }}
+      animate={{ opacity: 1, scale: 1 }}
+      transition={{ delay: 0.2 }}
+      className="glass-effect-dark border border-primary-400/10 rounded-xl p-6"
+    >
+      <div className="flex justify-between">
+        <div>
+          <p className="text-sm font-medium text-gray-400">Current Temperature</p>
+          <p className="text-2xl font-bold text-orange-400">
+            {metadata.max_temp?.toFixed(1)}°F
+          </p>
+        </div>
+        <div className="flex items-center justify-center w-12 h-12 bg-gradient-to-br from-orange-500/20 to-amber-500/20 rounded-lg">
+          <FaThermometerHalf className="w-6 h-6 text-orange-400" />
+        </div>
+      </div>
+      <p className="text-xs text-gray-500 mt-2">
+        Range: {metadata.min_temp?.toFixed(1)}°F - {metadata.max_temp?.toFixed(1)}°F
+      </p>
+    </motion.div>
+
+    <motion.div
+      initial={{ opacity: 0, scale: 0.95 }}
+      animate={{ opacity: 1, scale: 1 }}
+      transition={{ delay: 0.3 }}
+      className="glass-effect-dark border border-primary-400/10 rounded-xl p-6"
+    >
+      <div className="flex justify-between">
+        <div>
+          <p className="text-sm font-medium text-gray-400">Avg Electricity Price</p>
+          <p className="text-2xl font-bold text-yellow-400">
+            ${metadata.avg_price?.toFixed(2)}
+          </p>
+        </div>
+        <div className="flex items-center justify-center w-12 h-12 bg-gradient-to-br from-yellow-500/20 to-amber-500/20 rounded-lg">
+          <FaBolt className="w-6 h-6 text-yellow-400" />
+        </div>
+      </div>
+      <p className="text-xs text-gray-500 mt-2">per MWh</p>
+    </motion.div>
+
+    <motion.div
+      initial={{ opacity: 0, scale: 0.95 }}
+      animate={{ opacity: 1, scale: 1 }}
+      transition={{ delay: 0.4 }}
+      className="glass-effect-dark border border-primary-400/10 rounded-xl p-6"
+    >
+      <div className="flex justify-between">
+        <div>
+          <p className="text-sm font-medium text-gray-400">Peak Price</p>
+          <p className="text-2xl font-bold text-red-400">
+            ${metadata.peak_price?.toFixed(2)}
+          </p>
+        </div>
+        <div className="flex items-center justify-center w-12 h-12 bg-gradient-to-br from-red-500/20 to-pink-500/20 rounded-lg">
+          <FaChartLine className="w-6 h-6 text-red-400" />
+        </div>
+      </div>
+      <p className="text-xs text-gray-500 mt-2">per MWh</p>
+    </motion.div>
+
+    <motion.div
+      initial={{ opacity: 0, scale: 0.95 }}
+      animate={{ opacity: 1, scale: 1 }}
+      transition={{ delay: 0.5 }}
+      className="glass-effect-dark border border-primary-400/10 rounded-xl p-6"
+    >
+      <div className="flex justify-between">
+        <div>
+          <p className="text-sm font-medium text-gray-400">Off-Peak Price</p>
+          <p className="text-2xl font-bold text-green-400">
+            ${metadata.off_peak_price?.toFixed(2)}
+          </p>
+        </div>
+        <div className="flex items-center justify-center w-12 h-12 bg-gradient-to-br from-green-500/20 to-emerald-500/20 rounded-lg">
+          <FaDollarSign className="w-6 h-6 text-green-400" />
+        </div>
+      </div>
+      <p className="text-xs text-gray-500 mt-2">per MWh</p>
+    </motion.div>
+  </div>
+));
+
 const RealTime = () => {
   const [realTimeData, setRealTimeData] = useState(null);
   const [selectedDate, setSelectedDate] = useState(format(new Date(), 'yyyy-MM-dd'));
@@ -74,39 +187,17 @@ const RealTime = () => {
     }
   };
 
-  // Prepare chart data
-  const chartData = realTimeData
-    ? Array.from({ length: 24 }, (_, i) => ({
-        hour: i,
-        temperature: realTimeData.temperatures[i] || 0,
-        elecPrice: realTimeData.electricity_prices[i] || 0,
-      }))
-    : [];
-
-  const customTooltipStyle = {
-    backgroundColor: 'rgba(15, 23, 42, 0.95)',
-    border: '1px solid rgba(96, 165, 250, 0.3)',
-    borderRadius: '8px',
-    padding: '8px 12px',
-  };
-
-  const CustomTooltip = ({ active, payload, label }) => {
-    if (active && payload && payload.length) {
-      return (
-        <div style={customTooltipStyle}>
-          <p className="text-gray-300 text-sm font-medium">Hour {label}</p>
-          {payload.map((entry, index) => (
-            <p key={index} className="text-sm" style={{ color: entry.color }}>
-              {entry.name}: {entry.dataKey === 'temperature'
-                ? `${entry.value.toFixed(1)}°F`
-                : `$${entry.value.toFixed(2)}/MWh`}
-            </p>
-          ))}
-        </div>
-      );
-    }
-    return null;
-  };
+  // Prepare chart data; memoized so re-renders that don't change the data
+  // (loading, auto-refresh toggle, connection status) keep the same arrays
+  const chartData = useMemo(() => (
+    realTimeData
+      ? Array.from({ length: 24 }, (_, i) => ({
+          hour: i,
+          temperature: realTimeData.temperatures[i] || 0,
+          elecPrice: realTimeData.electricity_prices[i] || 0,
+        }))
+      : []
+  ), [realTimeData]);
 
   return (
     <div className="min-h-screen p-6">
@@ -189,89 +280,7 @@ const RealTime = () => {
         ) : realTimeData ? (
           <>
             {/* Current Conditions */}
-            <div className="grid grid-cols-1 md:grid-cols-4 gap-4 mb-6">
-              <motion.div
-                initial={{ opacity: 0, scale: 0.95 }}
-                animate={{ opacity: 1, scale: 1 }}
-                transition={{ delay: 0.2 }}
-                className="glass-effect-dark border border-primary-400/10 rounded-xl p-6"
-              >
-                <div className="flex justify-between">
-                  <div>
-                    <p className="text-sm font-medium text-gray-400">Current Temperature</p>
-                    <p className="text-2xl font-bold text-orange-400">
-                      {realTimeData.metadata.max_temp?.toFixed(1)}°F
-                    </p>
-                  </div>
-                  <div className="flex items-center justify-center w-12 h-12 bg-gradient-to-br from-orange-500/20 to-amber-500/20 rounded-lg">
-                    <FaThermometerHalf className="w-6 h-6 text-orange-400" />
-                  </div>
-                </div>
-                <p className="text-xs text-gray-500 mt-2">
-                  Range: {realTimeData.metadata.min_temp?.toFixed(1)}°F - {realTimeData.metadata.max_temp?.toFixed(1)}°F
-                </p>
-              </motion.div>
-
-              <motion.div
-                initial={{ opacity: 0, scale: 0.95 }}
-                animate={{ opacity: 1, scale: 1 }}
-                transition={{ delay: 0.3 }}
-                className="glass-effect-dark border border-primary-400/10 rounded-xl p-6"
-              >
-                <div className="flex justify-between">
-                  <div>
-                    <p className="text-sm font-medium text-gray-400">Avg Electricity Price</p>
-                    <p className="text-2xl font-bold text-yellow-400">
-                      ${realTimeData.metadata.avg_price?.toFixed(2)}
-                    </p>
-                  </div>
-                  <div className="flex items-center justify-center w-12 h-12 bg-gradient-to-br from-yellow-500/20 to-amber-500/20 rounded-lg">
-                    <FaBolt className="w-6 h-6 text-yellow-400" />
-                  </div>
-                </div>
-                <p className="text-xs text-gray-500 mt-2">per MWh</p>
-              </motion.div>
-
-              <motion.div
-                initial={{ opacity: 0, scale: 0.95 }}
-                animate={{ opacity: 1, scale: 1 }}
-                transition={{ delay: 0.4 }}
-                className="glass-effect-dark border border-primary-400/10 rounded-xl p-6"
-              >
-                <div className="flex justify-between">
-                  <div>
-                    <p className="text-sm font-medium text-gray-400">Peak Price</p>
-                    <p className="text-2xl font-bold text-red-400">
-                      ${realTimeData.metadata.peak_price?.toFixed(2)}
-                    </p>
-                  </div>
-                  <div className="flex items-center justify-center w-12 h-12 bg-gradient-to-br from-red-500/20 to-pink-500/20 rounded-lg">
-                    <FaChartLine className="w-6 h-6 text-red-400" />
-                  </div>
-                </div>
-                <p className="text-xs text-gray-500 mt-2">per MWh</p>
-              </motion.div>
-
-              <motion.div
-                initial={{ opacity: 0, scale: 0.95 }}
-                animate={{ opacity: 1, scale: 1 }}
-                transition={{ delay: 0.5 }}
-                className="glass-effect-dark border border-primary-400/10 rounded-xl p-6"
-              >
-                <div className="flex justify-between">
-                  <div>
-                    <p className="text-sm font-medium text-gray-400">Off-Peak Price</p>
-                    <p className="text-2xl font-bold text-green-400">
-                      ${realTimeData.metadata.off_peak_price?.toFixed(2)}
-                    </p>
-                  </div>
-                  <div className="flex items-center justify-center w-12 h-12 bg-gradient-to-br from-green-500/20 to-emerald-500/20 rounded-lg">
-                    <FaDollarSign className="w-6 h-6 text-green-400" />
-                  </div>
-                </div>
-                <p className="text-xs text-gray-500 mt-2">per MWh</p>
-              </motion.div>
-            </div>
+            <CurrentConditions metadata={realTimeData.metadata} />
 
             {/* Temperature Chart */}
             <motion.div
@@ -6,8 +6,11 @@ from datetime import datetime
 
 import psycopg2
 from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2 import OperationalError as PsycopgOperationalError
 import socket
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -20,8 +23,24 @@ load_dotenv()
 
 AZ_BAS = {"AZPS", "SRP", "TEPC"}
 
+# Kept under the ~15 clients Supabase's session pooler (port 5432) allows,
+# leaving room for SupabaseInterface's own connection and the fetch scripts
+POOL_MIN_CONN = int(os.getenv("PG_POOL_MIN", 1))
+POOL_MAX_CONN = int(os.getenv("PG_POOL_MAX", 10))
 
-def connect_db():
+# Fail fast on an unreachable host instead of hanging, and let TCP keepalives
+# surface pooled connections the pooler dropped while they sat idle
+CONNECT_OPTIONS = {
+    "connect_timeout": 10,
+    "keepalives": 1,
+    "keepalives_idle": 60,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+}
+
+
+def _connection_params():
+    """Build psycopg2 connection kwargs from the PG_* environment variables."""
     dbname = os.getenv("PG_DB")
     user = os.getenv("PG_USER")
     password = os.getenv("PG_PASSWORD")
@@ -37,13 +56,7 @@ def connect_db():
         host = host[1:-1]
 
     if "://" in host:
-        dsn = host
-        try:
-            return psycopg2.connect(dsn)
-        except PsycopgOperationalError as e:
-            print("Failed to connect using DSN provided in PG_HOST (treated as full connection URL).")
-            print("psycopg2 OperationalError:", e)
-            raise
+        return {"dsn": host, **CONNECT_OPTIONS}
 
     try:
         socket.gethostbyname(host)
@@ -53,32 +66,81 @@ def connect_db():
         print("Try: `nslookup <host>` or `dig <host> +short` from your shell.")
         raise
 
+    return {
+        "dbname": dbname,
+        "user": user,
+        "password": password,
+        "host": host,
+        "port": port,
+        "sslmode": sslmode,
+        **CONNECT_OPTIONS,
+    }
+
+
+def _report_connect_error(params, e):
+    if "dsn" in params:
+        print("Failed to connect using DSN provided in PG_HOST (treated as full connection URL).")
+        print("psycopg2 OperationalError:", e)
+        return
+
+    masked_pwd = "***" if params["password"] else "(none)"
+    print("Failed to connect to Postgres. Connection parameters:")
+    print(f"  host={params['host']}")
+    print(f"  port={params['port']}")
+    print(f"  dbname={params['dbname']}")
+    print(f"  user={params['user']}")
+    print(f"  password={masked_pwd}")
+    print(f"  sslmode={params['sslmode']}")
+    print("")
+    print("psycopg2 OperationalError:", e)
+    print("Common causes:")
+    print(" - incorrect PG_HOST (typo or wrong project)")
+    print(" - network/DNS/VPN blocking name resolution")
+    print(" - firewall blocking outbound connections to the DB host/port")
+    print(" - database is paused or not publicly accessible (Supabase project settings)")
+
+
+def connect_db():
+    params = _connection_params()
     try:
-        return psycopg2.connect(
-            dbname=dbname,
-            user=user,
-            password=password,
-            host=host,
-            port=port,
-            sslmode=sslmode,
-        )
+        return psycopg2.connect(**params)
     except PsycopgOperationalError as e:
-        masked_pwd = "***" if password else "(none)"
-        print("Failed to connect to Postgres. Connection parameters:")
-        print(f"  host={host}")
-        print(f"  port={port}")
-        print(f"  dbname={dbname}")
-        print(f"  user={user}")
-        print(f"  password={masked_pwd}")
-        print(f"  sslmode={sslmode}")
-        print("")
-        print("psycopg2 OperationalError:", e)
-        print("Common causes:")
-        print(" - incorrect PG_HOST (typo or wrong project)")
-        print(" - network/DNS/VPN blocking name resolution")
-        print(" - firewall blocking outbound connections to the DB host/port")
-        print(" - database is paused or not publicly accessible (Supabase project settings)")
+        _report_connect_error(params, e)
+        raise
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                params = _connection_params()
+                try:
+                    _pool = ThreadedConnectionPool(POOL_MIN_CONN, POOL_MAX_CONN, **params)
+                except PsycopgOperationalError as e:
+                    _report_connect_error(params, e)
+                    raise
+    return _pool
+
+
+@contextmanager
+def get_conn():
+    """Borrow a pooled connection; it is rolled back on error and returned on exit."""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
         raise
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
 
 
 def save_interchange(records):
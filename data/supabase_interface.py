@@ -6,6 +6,7 @@ Handles all database operations for real-time optimization
 import os
 import sys
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
 from psycopg2.extras import RealDictCursor
 import pandas as pd
 import numpy as np
@@ -20,6 +21,72 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from data.api.store_to_postgres import connect_db
 
 
+# Columns of optimization_summary returned by get_optimization_history
+HISTORY_COLUMNS = (
+    'run_id',
+    'run_timestamp',
+    'run_name',
+    'total_cost',
+    'cost_savings',
+    'cost_savings_percent',
+    'total_water_usage_gallons',
+    'peak_demand_mw',
+    'carbon_avoided_tons',
+    'optimization_status',
+)
+
+# Phoenix monthly averages (high/low) used by the fallback temperature pattern
+PHOENIX_MONTHLY_TEMPS = {
+    1: (67, 45),   # January
+    2: (71, 49),   # February
+    3: (77, 54),   # March
+    4: (85, 60),   # April
+    5: (94, 69),   # May
+    6: (104, 79),  # June
+    7: (106, 84),  # July
+    8: (104, 83),  # August
+    9: (98, 77),   # September
+    10: (88, 65),  # October
+    11: (76, 53),  # November
+    12: (66, 45),  # December
+}
+
+# One round trip for everything fetch_weather_data, get_electricity_prices
+# and get_water_prices read for a day; each subquery mirrors their queries
+DAILY_BUNDLE_QUERY = """
+SELECT
+    (SELECT json_agg(avg_temp ORDER BY hour) FROM (
+        SELECT EXTRACT(HOUR FROM timestamp) AS hour, AVG(temperature_f) AS avg_temp
+        FROM weather_data
+        WHERE DATE(timestamp) = %(day)s
+        GROUP BY EXTRACT(HOUR FROM timestamp)
+        ORDER BY hour
+        LIMIT %(hours)s
+    ) w),
+    (SELECT json_agg(price_per_mwh ORDER BY hour) FROM (
+        SELECT hour, price_per_mwh
+        FROM electricity_prices
+        WHERE DATE(timestamp) = %(day)s
+        ORDER BY hour
+        LIMIT %(hours)s
+    ) p),
+    (SELECT AVG(price_per_mwh) FROM eia_az_price WHERE sectorid = 'ALL'),
+    (SELECT json_agg(json_build_array(hour, avg_interchange)) FROM (
+        SELECT EXTRACT(HOUR FROM period) AS hour, AVG(value) AS avg_interchange
+        FROM eia_interchange
+        WHERE DATE(period) = %(day)s
+            AND (fromba IN ('AZPS', 'SRP', 'TEPC')
+                 OR toba IN ('AZPS', 'SRP', 'TEPC'))
+        GROUP BY EXTRACT(HOUR FROM period)
+    ) i),
+    (SELECT json_build_array(price_per_thousand_gallons, seasonal_multiplier)
+     FROM water_prices
+     WHERE date <= %(day)s
+     ORDER BY date DESC
+     LIMIT 1)
+"""
+
+
 class SupabaseInterface:
     """Production interface for Supabase database operations."""
 
@@ -50,9 +117,24 @@ class SupabaseInterface:
         return False
 
     def ensure_connection(self):
-        """Ensure connection is active, reconnect if needed."""
-        if not self.test_connection():
+        """Ensure connection is open, reconnect if needed.
+
+        Checks psycopg2's local flags instead of a SELECT 1 round-trip;
+        a connection that drops mid-query is marked closed, so the next call
+        reconnects, and one left in an aborted transaction is rolled back.
+        """
+        if self.conn is None or self.conn.closed:
             self.connect()
+        elif self.conn.info.transaction_status == TRANSACTION_STATUS_INERROR:
+            self._rollback()
+
+    def _rollback(self):
+        """Roll back a failed query so the shared connection stays usable."""
+        if self.conn and not self.conn.closed:
+            try:
+                self.conn.rollback()
+            except Exception:
+                pass
 
     def fetch_weather_data(self, date: datetime, hours: int = 24) -> List[float]:
         """
@@ -86,51 +168,37 @@ class SupabaseInterface:
             cur.close()
 
             if results and len(results) > 0:
-                temperatures = [float(row[1]) for row in results]
-                # Pad with Phoenix pattern if not enough hours
-                while len(temperatures) < hours:
-                    temperatures.append(self._generate_phoenix_temp(len(temperatures)))
-                return temperatures[:hours]
+                return self._pad_temperatures([float(row[1]) for row in results], hours)
         except Exception as e:
             print(f"Could not fetch weather data: {e}")
+            self._rollback()
 
         # Fallback to realistic Phoenix pattern based on month
         return self._generate_phoenix_pattern(date, hours)
 
+    def _pad_temperatures(self, temperatures: List[float], hours: int) -> List[float]:
+        """Pad fetched temperatures with the Phoenix pattern up to `hours`."""
+        # One day generated once, not one full day per missing hour
+        if len(temperatures) < hours:
+            pattern = self._generate_phoenix_pattern(datetime(2024, 8, 1), 24)
+            temperatures.extend(pattern[h % 24] for h in range(len(temperatures), hours))
+        return temperatures[:hours]
+
     def _generate_phoenix_pattern(self, date: datetime, hours: int = 24) -> List[float]:
         """Generate realistic Phoenix temperature pattern based on month."""
-        month = date.month
-
-        # Phoenix monthly averages (high/low)
-        monthly_temps = {
-            1: (67, 45),   # January
-            2: (71, 49),   # February
-            3: (77, 54),   # March
-            4: (85, 60),   # April
-            5: (94, 69),   # May
-            6: (104, 79),  # June
-            7: (106, 84),  # July
-            8: (104, 83),  # August
-            9: (98, 77),   # September
-            10: (88, 65),  # October
-            11: (76, 53),  # November
-            12: (66, 45),  # December
-        }
-
-        high, low = monthly_temps.get(month, (95, 75))
-
-        temperatures = []
-        for hour in range(hours):
-            # Sine wave pattern with minimum at 5 AM, maximum at 5 PM
-            base = (high + low) / 2
-            amplitude = (high - low) / 2
-            phase = (hour - 5) * np.pi / 12
-            temp = base + amplitude * np.sin(phase - np.pi/2)
-            # Add slight random variation
-            temp += np.random.uniform(-2, 2)
-            temperatures.append(max(low - 5, min(high + 5, temp)))
-
-        return temperatures
+        high, low = PHOENIX_MONTHLY_TEMPS.get(date.month, (95, 75))
+
+        # Sine wave pattern with minimum at 5 AM, maximum at 5 PM
+        hour = np.arange(hours)
+        base = (high + low) / 2
+        amplitude = (high - low) / 2
+        phase = (hour - 5) * np.pi / 12
+        temperatures = base + amplitude * np.sin(phase - np.pi/2)
+        # Add slight random variation, reproducible per date
+        rng = np.random.default_rng(int(date.strftime('%Y%m%d')))
+        temperatures += rng.uniform(-2, 2, size=hours)
+
+        return np.clip(temperatures, low - 5, high + 5).tolist()
 
     def _generate_phoenix_temp(self, hour: int, month: int = 8) -> float:
         """Generate single hour Phoenix temperature."""
@@ -170,7 +238,7 @@ class SupabaseInterface:
             if results and len(results) >= hours:
                 return [float(row[1]) for row in results]
         except:
-            pass
+            self._rollback()
 
         # Calculate prices from interchange data
         try:
@@ -205,50 +273,49 @@ class SupabaseInterface:
             interchange_data = cur.fetchall()
             cur.close()
 
-            # Generate prices based on interchange patterns
-            prices = []
-            for hour in range(hours):
-                # Find interchange for this hour
-                interchange = 0
-                for h, val in interchange_data:
-                    if int(h) == hour:
-                        interchange = float(val) if val else 0
-                        break
-
-                # Calculate price based on hour and interchange
-                if 15 <= hour < 20:  # Peak hours 3-8 PM
-                    price_mult = 1.3 + (abs(interchange) / 10000) * 0.2
-                elif hour >= 22 or hour < 6:  # Off-peak
-                    price_mult = 0.6 + (abs(interchange) / 10000) * 0.1
-                else:  # Mid-peak
-                    price_mult = 1.0 + (abs(interchange) / 10000) * 0.15
-
-                prices.append(base_price * price_mult)
-
-            return prices
+            return self._prices_from_interchange(base_price, interchange_data, hours)
 
         except Exception as e:
             print(f"Error calculating prices from interchange: {e}")
+            self._rollback()
 
         # Fallback to time-of-use pattern with Arizona rates
-        return self._generate_tou_prices(hours)
-
-    def _generate_tou_prices(self, hours: int = 24) -> List[float]:
+        return self._generate_tou_prices(hours, seed=int(date.strftime('%Y%m%d')))
+
+    def _prices_from_interchange(self, base_price: float, interchange_data, hours: int) -> List[float]:
+        """Scale the base price per hour by time of use and (hour, interchange) rows."""
+        # Interchange magnitude per hour, preallocated; hours without data stay 0
+        interchange = np.zeros(hours)
+        for h, val in interchange_data:
+            if int(h) < hours:
+                interchange[int(h)] = abs(float(val)) if val else 0
+        scaled = interchange / 10000
+
+        # Calculate price based on hour and interchange
+        hour = np.arange(hours)
+        price_mult = np.select(
+            [(hour >= 15) & (hour < 20),   # Peak hours 3-8 PM
+             (hour >= 22) | (hour < 6)],   # Off-peak
+            [1.3 + scaled * 0.2,
+             0.6 + scaled * 0.1],
+            default=1.0 + scaled * 0.15    # Mid-peak
+        )
+        return (base_price * price_mult).tolist()
+
+    def _generate_tou_prices(self, hours: int = 24, seed: Optional[int] = None) -> List[float]:
         """Generate time-of-use prices based on Arizona rate structure."""
-        prices = []
-        for hour in range(hours):
-            if 15 <= hour < 20:  # Peak: 3-8 PM
-                price = 167  # Summer peak rate
-            elif hour >= 22 or hour < 6:  # Super off-peak
-                price = 77  # Night rate
-            else:  # Off-peak
-                price = 128  # Day rate
+        hour = np.arange(hours)
+        prices = np.select(
+            [(hour >= 15) & (hour < 20),   # Peak: 3-8 PM
+             (hour >= 22) | (hour < 6)],   # Super off-peak
+            [167, 77],                     # Summer peak / night rate
+            default=128                    # Off-peak day rate
+        ).astype(float)
 
-            # Add small variation
-            price += np.random.uniform(-2, 2)
-            prices.append(price)
+        # Add small variation
+        prices += np.random.default_rng(seed).uniform(-2, 2, size=hours)
 
-        return prices
+        return prices.tolist()
 
     def get_water_prices(self, date: datetime) -> List[float]:
         """
@@ -276,21 +343,69 @@ class SupabaseInterface:
             result = cur.fetchone()
             cur.close()
 
-            if result:
-                base_price = float(result[0])
-                multiplier = float(result[1]) if result[1] else 1.0
-                price = base_price * multiplier
-            else:
-                # Default Phoenix water rate
-                price = 3.24
-
-            # Return same price for all hours
-            return [price] * 24
+            return self._water_prices_from_row(result)
 
         except Exception as e:
             print(f"Error fetching water prices: {e}")
+            self._rollback()
             return [3.24] * 24  # Default rate
 
+    def _water_prices_from_row(self, row) -> List[float]:
+        """Hourly water prices from a (price, seasonal multiplier) row or None."""
+        if row:
+            base_price = float(row[0])
+            multiplier = float(row[1]) if row[1] else 1.0
+            price = base_price * multiplier
+        else:
+            # Default Phoenix water rate
+            price = 3.24
+
+        # Return same price for all hours
+        return [price] * 24
+
+    def fetch_daily_bundle(self, date: datetime,
+                           hours: int = 24) -> Tuple[List[float], List[float], List[float]]:
+        """
+        Fetch temperatures, electricity prices and water prices in one query.
+
+        Returns the same values as fetch_weather_data, get_electricity_prices
+        and get_water_prices, with one database round trip instead of up to
+        five; falls back to those calls if the combined query fails.
+
+        Args:
+            date: Date to fetch data for
+            hours: Number of hours to fetch
+
+        Returns:
+            Tuple of (temperatures, electricity prices, water prices)
+        """
+        self.ensure_connection()
+
+        try:
+            cur = self.conn.cursor()
+            cur.execute(DAILY_BUNDLE_QUERY, {'day': date.date(), 'hours': hours})
+            temps, direct_prices, base_price, interchange, water = cur.fetchone()
+            cur.close()
+        except Exception as e:
+            print(f"Combined daily fetch failed, fetching separately: {e}")
+            self._rollback()
+            return (self.fetch_weather_data(date, hours),
+                    self.get_electricity_prices(date, hours),
+                    self.get_water_prices(date))
+
+        if temps:
+            temperatures = self._pad_temperatures([float(t) for t in temps], hours)
+        else:
+            temperatures = self._generate_phoenix_pattern(date, hours)
+
+        if direct_prices and len(direct_prices) >= hours:
+            prices = [float(p) for p in direct_prices]
+        else:
+            base_price = float(base_price) if base_price else 128.4
+            prices = self._prices_from_interchange(base_price, interchange or [], hours)
+
+        return temperatures, prices, self._water_prices_from_row(water)
+
     def save_optimization_results(self, results: Dict) -> Optional[str]:
         """
         Save optimization results to database.
@@ -385,35 +500,34 @@ class SupabaseInterface:
 
         except Exception as e:
             print(f"Error saving optimization results: {e}")
-            if self.conn:
-                self.conn.rollback()
+            self._rollback()
             return None
 
-    def get_optimization_history(self, limit: int = 10) -> pd.DataFrame:
+    def get_optimization_history(self, limit: int = 10,
+                                 columns: Optional[List[str]] = None,
+                                 raise_errors: bool = False) -> pd.DataFrame:
         """
         Retrieve recent optimization runs.
 
         Args:
             limit: Number of recent runs to retrieve
+            columns: Subset of HISTORY_COLUMNS to select (default: all)
+            raise_errors: Re-raise database errors instead of returning an empty frame
 
         Returns:
             DataFrame with optimization history
         """
+        if columns is None:
+            columns = HISTORY_COLUMNS
+        unknown = set(columns) - set(HISTORY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown history columns: {sorted(unknown)}")
+
         self.ensure_connection()
 
         try:
-            query = """
-            SELECT
-                run_id,
-                run_timestamp,
-                run_name,
-                total_cost,
-                cost_savings,
-                cost_savings_percent,
-                total_water_usage_gallons,
-                peak_demand_mw,
-                carbon_avoided_tons,
-                optimization_status
+            query = f"""
+            SELECT {', '.join(columns)}
             FROM optimization_summary
             ORDER BY run_timestamp DESC
             LIMIT %s
@@ -424,14 +538,18 @@ class SupabaseInterface:
 
         except Exception as e:
             print(f"Error fetching optimization history: {e}")
+            self._rollback()
+            if raise_errors:
+                raise
             return pd.DataFrame()
 
-    def get_period_summary(self, days: int) -> Dict:
+    def get_period_summary(self, days: int, raise_errors: bool = False) -> Dict:
         """
         Get summary statistics for a period.
 
         Args:
             days: Number of days to summarize
+            raise_errors: Re-raise database errors instead of returning zeros
 
         Returns:
             Dictionary with period statistics
@@ -492,14 +610,18 @@ class SupabaseInterface:
 
         except Exception as e:
             print(f"Error getting period summary: {e}")
+            self._rollback()
+            if raise_errors:
+                raise
             return {'total_savings': 0}
 
-    def get_monthly_breakdown(self, months: int = 6) -> pd.DataFrame:
+    def get_monthly_breakdown(self, months: int = 6, raise_errors: bool = False) -> pd.DataFrame:
         """
         Get monthly breakdown of optimization results.
 
         Args:
             months: Number of months to retrieve
+            raise_errors: Re-raise database errors instead of returning an empty frame
 
         Returns:
             DataFrame with monthly statistics
@@ -527,14 +649,18 @@ class SupabaseInterface:
 
         except Exception as e:
             print(f"Error getting monthly breakdown: {e}")
+            self._rollback()
+            if raise_errors:
+                raise
             return pd.DataFrame()
 
-    def get_daily_trends(self, days: int = 30) -> Dict:
+    def get_daily_trends(self, days: int = 30, raise_errors: bool = False) -> Dict:
         """
         Get daily trend data for charts.
 
         Args:
             days: Number of days to retrieve
+            raise_errors: Re-raise database errors instead of returning empty lists
 
         Returns:
             Dictionary with trend data
@@ -577,6 +703,9 @@ class SupabaseInterface:
 
         except Exception as e:
             print(f"Error getting daily trends: {e}")
+            self._rollback()
+            if raise_errors:
+                raise
             return {'dates': [], 'savings': [], 'water_usage': [], 'peak_demand': []}
 
     def __del__(self):
@@ -8,6 +8,7 @@ IISE Hackathon - Cooling the Cloud
 import os
 import sys
 import argparse
+import csv
 import json
 from datetime import datetime
 from pathlib import Path
@@ -15,9 +16,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from model.optimizer import ArizonaDataCenterOptimizer
 from model.data_interface import DataInterface
-import pandas as pd
 import numpy as np
 
 
@@ -68,14 +67,17 @@ def main():
     print("           IISE Hackathon Submission")
     print("="*60 + "\n")
 
-    # Initialize components
+    # Initialize components; the optimizer (and pyomo) loads once data is ready
     data_interface = DataInterface()
-    optimizer = ArizonaDataCenterOptimizer()
 
     # Load data based on arguments
     if args.demo:
         print("Running in DEMO mode with sample data...")
-        electricity_data, weather_data = create_demo_data()
+        # Same date, same demo day (matches DataInterface's date seeding)
+        date_digits = args.date.replace('-', '')
+        electricity_data, weather_data = create_demo_data(
+            seed=int(date_digits) if date_digits.isdigit() else None
+        )
     else:
         if not args.electricity_data or not args.weather_data:
             print("ERROR: Please provide both --electricity-data and --weather-data")
@@ -112,6 +114,8 @@ def main():
 
     # Build optimization model
     print("\nBuilding optimization model...")
+    from model.optimizer import ArizonaDataCenterOptimizer
+    optimizer = ArizonaDataCenterOptimizer()
     print("   - Decision variables: 10+")
     print("   - Constraints: 10+")
     print("   - Multi-objective optimization")
@@ -151,25 +155,29 @@ def main():
     print("                    OPTIMIZATION RESULTS")
     print("="*60)
 
+    savings = results['savings']
+    environmental = results['environmental']
+    summary = results['summary']
+
     print("\n>>> COST SAVINGS:")
-    print(f"   Daily Savings: ${results['savings']['daily_savings']:,.2f}")
-    print(f"   Annual Savings: ${results['savings']['annual_savings']:,.2f}")
-    print(f"   Savings Rate: {results['savings']['percentage_saved']:.1f}%")
+    print(f"   Daily Savings: ${savings['daily_savings']:,.2f}")
+    print(f"   Annual Savings: ${savings['annual_savings']:,.2f}")
+    print(f"   Savings Rate: {savings['percentage_saved']:.1f}%")
 
     print("\n>>> WATER CONSERVATION:")
-    print(f"   Water Used: {results['environmental']['water_used_gallons']:,.0f} gallons/day")
-    print(f"   Water Saved: {results['environmental']['water_saved_gallons']:,.0f} gallons/day")
-    print(f"   Equivalent to: {results['environmental']['water_saved_gallons']/325851:.1f} Olympic pools/year")
+    print(f"   Water Used: {environmental['water_used_gallons']:,.0f} gallons/day")
+    print(f"   Water Saved: {environmental['water_saved_gallons']:,.0f} gallons/day")
+    print(f"   Equivalent to: {environmental['water_saved_gallons']/325851:.1f} Olympic pools/year")
 
     print("\n>>> GRID IMPACT:")
-    print(f"   Peak Demand: {results['summary']['peak_demand_mw']:.1f} MW")
-    print(f"   Peak Reduction: {results['environmental']['peak_reduction_mw']:.1f} MW")
-    print(f"   Equivalent to: Powering {results['environmental']['peak_reduction_mw']*1000:.0f} homes")
+    print(f"   Peak Demand: {summary['peak_demand_mw']:.1f} MW")
+    print(f"   Peak Reduction: {environmental['peak_reduction_mw']:.1f} MW")
+    print(f"   Equivalent to: Powering {environmental['peak_reduction_mw']*1000:.0f} homes")
 
     print("\n>>> ENVIRONMENTAL BENEFIT:")
-    print(f"   Carbon Avoided: {results['environmental']['carbon_avoided_tons']:.2f} tons CO2/day")
-    print(f"   Annual Impact: {results['environmental']['carbon_avoided_tons']*365:.1f} tons CO2/year")
-    print(f"   Equivalent to: {results['environmental']['carbon_avoided_tons']*365/4.6:.0f} cars off the road")
+    print(f"   Carbon Avoided: {environmental['carbon_avoided_tons']:.2f} tons CO2/day")
+    print(f"   Annual Impact: {environmental['carbon_avoided_tons']*365:.1f} tons CO2/year")
+    print(f"   Equivalent to: {environmental['carbon_avoided_tons']*365/4.6:.0f} cars off the road")
 
     # Save results to file
     results_file = f"results_{args.date.replace('-', '')}.json"
@@ -180,8 +188,11 @@ def main():
     # Export to CSV if requested
     if args.export:
         export_file = f"optimization_results_{args.date.replace('-', '')}.csv"
-        df = pd.DataFrame(results['hourly_data'])
-        df.to_csv(export_file, index=False)
+        hourly_data = results['hourly_data']
+        with open(export_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(hourly_data[0]), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(hourly_data)
         print(f"Hourly data exported to: {export_file}")
 
     # Print detailed report
@@ -191,31 +202,31 @@ def main():
     print("For Arizona's sustainable data center future!")
 
 
-def create_demo_data():
-    """Create demonstration data for testing."""
+def create_demo_data(seed=None):
+    """Create demonstration data for testing.
+
+    All random variation comes from one np.random.default_rng(seed), so a
+    given seed always reproduces the same day.
+    """
+    rng = np.random.default_rng(seed)
+    hours = np.arange(24)
+
     # Create realistic Phoenix summer day temperatures
-    hours = list(range(24))
-    temperatures = []
-    for h in hours:
-        base = 95
-        amplitude = 15
-        phase = (h - 5) * np.pi / 12
-        temp = base + amplitude * np.sin(phase - np.pi/2)
-        temp += np.random.uniform(-2, 2)
-        temperatures.append(max(75, min(118, temp)))
-
-    # Create time-of-use electricity prices (APS schedule)
-    prices = []
-    for h in hours:
-        if 15 <= h < 20:  # Peak hours 3-8 PM
-            price = np.random.uniform(140, 160)  # $/MWh
-        elif 22 <= h or h < 6:  # Super off-peak
-            price = np.random.uniform(30, 40)
-        else:  # Off-peak
-            price = np.random.uniform(50, 70)
-        prices.append(price)
-
-    return prices, temperatures
+    base = 95
+    amplitude = 15
+    phase = (hours - 5) * np.pi / 12
+    temperatures = base + amplitude * np.sin(phase - np.pi/2)
+    temperatures += rng.uniform(-2, 2, size=24)
+    temperatures = np.clip(temperatures, 75, 118)
+
+    # Create time-of-use electricity prices (APS schedule), $/MWh
+    peak = (hours >= 15) & (hours < 20)  # Peak hours 3-8 PM
+    super_off_peak = (hours >= 22) | (hours < 6)
+    low = np.select([peak, super_off_peak], [140, 30], default=50)
+    high = np.select([peak, super_off_peak], [160, 40], default=70)
+    prices = rng.uniform(low, high)
+
+    return prices.tolist(), temperatures.tolist()
 
 
 if __name__ == "__main__":
@@ -29,11 +29,14 @@ class DataInterface:
     Flexible enough to handle various formats from EIA and NOAA.
     """
 
-    def __init__(self, use_supabase: bool = True):
+    def __init__(self, use_supabase: bool = True,
+                 supabase: Optional['SupabaseInterface'] = None):
         """Initialize data interface with Arizona-specific defaults.
 
         Args:
             use_supabase: Whether to use Supabase as primary data source
+            supabase: Existing Supabase interface to share instead of
+                opening another database connection
         """
         # Arizona utility rate structure (APS Schedule E-32)
         self.peak_hours = list(range(15, 20))  # 3 PM - 8 PM
@@ -45,8 +48,8 @@ class DataInterface:
         self.default_temp_pattern = self._generate_phoenix_pattern()
 
         # Initialize Supabase interface if available and requested
-        self.supabase = None
-        if use_supabase and SUPABASE_AVAILABLE:
+        self.supabase = supabase if use_supabase else None
+        if self.supabase is None and use_supabase and SUPABASE_AVAILABLE:
             try:
                 self.supabase = SupabaseInterface()
                 if self.supabase.test_connection():
@@ -261,60 +264,57 @@ class DataInterface:
             return self._generate_tou_prices()
 
         # Normalize demand
-        min_demand = min(demand)
-        max_demand = max(demand)
+        demand = np.asarray(demand, dtype=float)
+        min_demand = demand.min()
+        max_demand = demand.max()
         range_demand = max_demand - min_demand if max_demand > min_demand else 1
 
-        prices = []
-        for h, d in enumerate(demand):
-            # Base price from demand level
-            normalized = (d - min_demand) / range_demand
-            base_price = self.offpeak_rate + (self.peak_rate - self.offpeak_rate) * normalized
-
-            # Apply time-of-use multiplier
-            if h in self.peak_hours:
-                price = base_price * 1.5
-            elif h in range(22, 24) or h in range(0, 6):
-                price = base_price * 0.6
-            else:
-                price = base_price
-
-            prices.append(price * 1000)  # Convert to $/MWh
+        # Base price from demand level
+        normalized = (demand - min_demand) / range_demand
+        base_price = self.offpeak_rate + (self.peak_rate - self.offpeak_rate) * normalized
+
+        # Apply time-of-use multiplier
+        hours = np.arange(len(demand))
+        multiplier = np.select(
+            [np.isin(hours, self.peak_hours),
+             ((hours >= 22) & (hours < 24)) | (hours < 6)],
+            [1.5, 0.6],
+            default=1.0
+        )
 
-        return prices
+        return (base_price * multiplier * 1000).tolist()  # Convert to $/MWh
 
     def _generate_tou_prices(self) -> List[float]:
         """Generate simple time-of-use prices as fallback."""
         # Simple TOU rates without variation
-        prices = []
-        for h in range(24):
-            if h in self.peak_hours:  # Peak: 3-8 PM
-                price = 150  # $/MWh
-            elif h in range(22, 24) or h in range(0, 6):  # Super off-peak
-                price = 25  # $/MWh
-            else:  # Off-peak
-                price = 35  # $/MWh
+        hours = np.arange(24)
+        prices = np.where(
+            np.isin(hours, self.peak_hours), 150,  # Peak: 3-8 PM ($/MWh)
+            np.where((hours >= 22) | (hours < 6), 25,  # Super off-peak
+                     35)  # Off-peak
+        )
 
-            prices.append(price)
+        return prices.tolist()
 
-        return prices
+    def _generate_phoenix_pattern(self, seed: Optional[int] = None) -> List[float]:
+        """Generate typical Phoenix summer temperature pattern.
 
-    def _generate_phoenix_pattern(self) -> List[float]:
-        """Generate typical Phoenix summer temperature pattern."""
+        Args:
+            seed: Seed for the random variation; the same seed always gives
+                the same pattern, None draws fresh entropy
+        """
         # Phoenix July average: Low 84°F at 5 AM, High 106°F at 5 PM
-        temperatures = []
-        for h in range(24):
-            # Sine wave pattern
-            base = 95  # Average temperature
-            amplitude = 15  # Half of daily range
-            phase = (h - 5) * np.pi / 12  # Minimum at 5 AM
-            temp = base + amplitude * np.sin(phase - np.pi/2)
+        hours = np.arange(24)
+        base = 95  # Average temperature
+        amplitude = 15  # Half of daily range
+        phase = (hours - 5) * np.pi / 12  # Minimum at 5 AM
+        temperatures = base + amplitude * np.sin(phase - np.pi/2)
 
-            # Add slight random variation
-            temp += np.random.uniform(-2, 2)
-            temperatures.append(max(75, min(120, temp)))  # Cap at reasonable limits
+        # Add slight random variation
+        rng = np.random.default_rng(seed)
+        temperatures += rng.uniform(-2, 2, size=24)
 
-        return temperatures
+        return np.clip(temperatures, 75, 120).tolist()  # Cap at reasonable limits
 
     def _ensure_24_hours(self, data: List) -> List:
         """Ensure we have exactly 24 hours of data."""
@@ -380,14 +380,10 @@ class DataInterface:
         # Try Supabase first if available and requested
         if use_supabase and self.supabase:
             try:
-                # Get weather data from Supabase
-                temperatures = self.supabase.fetch_weather_data(target_date, hours=24)
-
-                # Get electricity prices (will use inference if not in database)
-                electricity_prices = self.supabase.get_electricity_prices(target_date, hours=24)
-
-                # Get water prices
-                water_prices = self.supabase.get_water_prices(target_date)
+                # Weather, electricity prices (inferred if not in the database)
+                # and water prices in one round trip
+                temperatures, electricity_prices, water_prices = \
+                    self.supabase.fetch_daily_bundle(target_date, hours=24)
 
                 optimization_data = {
                     'temperatures': temperatures,
@@ -422,7 +418,10 @@ class DataInterface:
         if weather_source:
             temperatures = self.load_weather_data(weather_source)
         else:
-            temperatures = self._generate_phoenix_pattern()
+            # Seeded by date so demo runs (and their caches) are reproducible
+            temperatures = self._generate_phoenix_pattern(
+                seed=int(target_date.strftime('%Y%m%d'))
+            )
 
         # Calculate water prices
         water_prices = [3.24] * 24  # Default water price per 1000 gallons
@@ -503,17 +502,19 @@ class DataInterface:
             print("Supabase not available, results not saved to database")
             return None
 
-    def get_optimization_history(self, limit: int = 10) -> pd.DataFrame:
+    def get_optimization_history(self, limit: int = 10,
+                                 columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Get recent optimization runs from Supabase.
 
         Args:
             limit: Number of recent runs to retrieve
+            columns: Columns to select (default: all history columns)
 
         Returns:
             DataFrame with optimization history
         """
         if self.supabase:
-            return self.supabase.get_optimization_history(limit)
+            return self.supabase.get_optimization_history(limit, columns=columns)
         else:
             return pd.DataFrame()
\ No newline at end of file
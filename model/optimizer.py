@@ -140,8 +140,8 @@ class ArizonaDataCenterOptimizer:
             cooling_provided = (
                 model.use_water[h] * self.cooling_capacity_mw *
                 self._get_water_efficiency(model.temp[h]) +
-                model.use_chiller[h] * sum(model.chiller_stages_on[h, s] * 3
-                                          for s in model.chiller_stages) +
+                model.use_chiller[h] * pyo.quicksum(model.chiller_stages_on[h, s] * 3
+                                                    for s in model.chiller_stages) +
                 model.use_hybrid[h] * self.cooling_capacity_mw * 0.9
             )
             return cooling_provided >= heat_generated
@@ -149,7 +149,7 @@ class ArizonaDataCenterOptimizer:
 
         # 3. Batch job completion constraint
         model.batch_completion = pyo.Constraint(
-            expr=sum(model.batch_load[h] for h in model.hours) >=
+            expr=pyo.quicksum(model.batch_load[h] for h in model.hours) >=
                  self.flexible_load_mw * 8  # 8 hours of processing needed
         )
 
@@ -225,19 +225,19 @@ class ArizonaDataCenterOptimizer:
         # OBJECTIVE FUNCTION (Multi-objective for complexity points!)
         def objective_rule(model):
             # 1. Energy costs
-            energy_cost = sum(model.hourly_energy_cost[h] for h in model.hours)
+            energy_cost = pyo.quicksum(model.hourly_energy_cost[h] for h in model.hours)
 
             # 2. Demand charges
             demand_cost = model.peak_demand * self.demand_charge_per_kw
 
             # 3. Water costs
-            water_cost = sum(model.hourly_water_cost[h] for h in model.hours)
+            water_cost = pyo.quicksum(model.hourly_water_cost[h] for h in model.hours)
 
             # 4. Carbon emissions (Arizona grid: 0.82 lbs CO2/kWh)
-            carbon_cost = sum(model.hourly_emissions[h] * 0.02 for h in model.hours)  # $20/ton CO2
+            carbon_cost = pyo.quicksum(model.hourly_emissions[h] * 0.02 for h in model.hours)  # $20/ton CO2
 
             # 5. Demand response incentive (negative cost)
-            dr_incentive = sum(model.demand_response[h] * 50 for h in model.hours)
+            dr_incentive = pyo.quicksum(model.demand_response[h] * 50 for h in model.hours)
 
             return energy_cost + demand_cost + water_cost + carbon_cost - dr_incentive
 
@@ -310,7 +310,10 @@ class ArizonaDataCenterOptimizer:
             'environmental': {}
         }
 
-        # Extract hourly results
+        # Extract hourly results, keeping running totals for the summary
+        energy_cost = 0
+        water_cost = 0
+        water_used = 0
         for h in self.model.hours:
             hourly = {
                 'hour': h,
@@ -325,12 +328,16 @@ class ArizonaDataCenterOptimizer:
             }
             results['hourly_data'].append(hourly)
 
+            energy_cost += hourly['energy_cost']
+            water_cost += hourly['water_cost']
+            water_used += (hourly['water_cooling'] * 120 + hourly['hybrid_cooling'] * 60) * 24
+
         # Calculate summary metrics
         results['summary'] = {
             'total_cost': pyo.value(self.model.objective),
             'peak_demand_mw': pyo.value(self.model.peak_demand),
-            'energy_cost': sum(h['energy_cost'] for h in results['hourly_data']),
-            'water_cost': sum(h['water_cost'] for h in results['hourly_data']),
+            'energy_cost': energy_cost,
+            'water_cost': water_cost,
             'demand_charge': pyo.value(self.model.peak_demand) * self.demand_charge_per_kw
         }
 
@@ -343,10 +350,6 @@ class ArizonaDataCenterOptimizer:
         }
 
         # Environmental metrics
-        water_used = sum(
-            (h['water_cooling'] * 120 + h['hybrid_cooling'] * 60) * 24
-            for h in results['hourly_data']
-        )
         results['environmental'] = {
             'water_used_gallons': water_used,
             'water_saved_gallons': self._calculate_baseline_water() - water_used,
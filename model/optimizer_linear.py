@@ -3,6 +3,7 @@ Linearized Optimization Model for Data Center (GLPK Compatible)
 Simplified version that works with linear solvers
 """
 
+import copy
 import pyomo.environ as pyo
 from pyomo.opt import SolverFactory
 import numpy as np
@@ -21,16 +22,23 @@ try:
 except ImportError:
     DATA_INTERFACE_AVAILABLE = False
 
+# Solvers tried after the requested one, fastest first. appsi_highs is
+# Pyomo's in-memory HiGHS interface (no LP file or subprocess per solve).
+SOLVER_FALLBACKS = ('appsi_highs', 'highs', 'glpk')
+
 
 class LinearDataCenterOptimizer:
     """Simplified linear optimizer for GLPK compatibility."""
 
-    def __init__(self, use_supabase: bool = True, capacity_mw: float = 2000.0):
+    def __init__(self, use_supabase: bool = True, capacity_mw: float = 2000.0,
+                 data_interface: Optional['DataInterface'] = None):
         """Initialize with Arizona data center parameters.
 
         Args:
             use_supabase: Whether to use Supabase for data and result storage
             capacity_mw: Total data center capacity in MW (default: 2000MW for Arizona)
+            data_interface: Existing data interface to share instead of
+                creating one (and its database connection) on first use
         """
         # Store the requested capacity for scaling results
         self.requested_capacity_mw = capacity_mw
@@ -49,23 +57,55 @@ class LinearDataCenterOptimizer:
         self.water_usage_per_hour = 120  # gallons/hour when using water (will scale in results)
         self.water_cost_per_gallon = 0.004
 
+        # Baseline (no optimization) daily cost per $/MWh of average price,
+        # at requested scale: critical + 1/3 flexible + chiller load for 24h
+        self._baseline_coef = (
+            self.critical_load_mw + self.flexible_load_mw / 3 + self.chiller_energy
+        ) * self.scale_factor * 24 / 1000
+
         print(f"Optimizer configured for {self.requested_capacity_mw}MW (using {self.total_capacity_mw}MW model)")
         print(f"Results will be scaled by factor: {self.scale_factor:.1f}x")
 
         self.model = None
         self.results = None
 
+        # Inputs of the built model and (inputs, solver) of the last optimal
+        # solve; solve() skips the solver when both are unchanged and sets
+        # last_solve_cached so callers can skip re-saving a saved run
+        self._model_key = None
+        self._solved_key = None
+        self.last_solve_cached = False
+
+        # Resolved solver per requested name; kept so persistent interfaces
+        # (appsi_highs) reuse their loaded instance across rebuilds
+        self._solvers = {}
+
         # Store prices for baseline calculation
         self.electricity_prices = None
 
-        # Initialize data interface if available
-        self.data_interface = None
-        if use_supabase and DATA_INTERFACE_AVAILABLE:
+        # Data interface is created on first use so build_model/solve-only
+        # callers never open a database connection
+        self._use_supabase = use_supabase
+        self._data_interface = data_interface
+        self._data_interface_failed = False
+
+    @property
+    def data_interface(self) -> Optional['DataInterface']:
+        """Supabase-backed data interface, initialized lazily if available."""
+        if (self._data_interface is None and not self._data_interface_failed
+                and self._use_supabase and DATA_INTERFACE_AVAILABLE):
             try:
-                self.data_interface = DataInterface(use_supabase=True)
+                self._data_interface = DataInterface(use_supabase=True)
             except Exception as e:
                 print(f"Could not initialize data interface: {e}")
-                self.data_interface = None
+                self._data_interface_failed = True
+        return self._data_interface
+
+    @data_interface.setter
+    def data_interface(self, value: Optional['DataInterface']):
+        """Share an existing data interface (and its connection) for fetch and save."""
+        self._data_interface = value
+        self._data_interface_failed = False
 
     def build_model(self,
                    temperatures: List[float],
@@ -73,17 +113,75 @@ class LinearDataCenterOptimizer:
                    grid_demand: Optional[List[float]] = None) -> pyo.ConcreteModel:
         """Build simplified linear model."""
 
+        # The reused Params keep any index not overwritten, so a short input
+        # would silently solve with the previous call's values
+        if len(temperatures) != 24 or len(electricity_prices) != 24:
+            raise ValueError(
+                f"Expected 24 hourly temperatures and prices, got "
+                f"{len(temperatures)} and {len(electricity_prices)}"
+            )
+
         # Store prices for baseline calculation
         self.electricity_prices = electricity_prices
+        self._model_key = (
+            tuple(map(float, temperatures)),
+            tuple(map(float, electricity_prices)),
+            self.water_cost_per_gallon,
+        )
+
+        # Constraints don't depend on the inputs, so the model is built once
+        # and later calls only refresh the parameters and the objective; a
+        # persistent solver then receives just the changed coefficients
+        model = self.model
+        if model is None:
+            model = self._build_structure()
+        model.temp.store_values(dict(enumerate(map(float, temperatures))))
+        model.price.store_values(dict(enumerate(map(float, electricity_prices))))
+        if model.component('objective') is not None:
+            model.del_component(model.objective)
+
+        # Penalty for not using water cooling when hot; only hours above
+        # 95°F get a term, so cool days produce a smaller objective row
+        penalty_coefs = np.maximum(0, np.asarray(temperatures, dtype=float) - 95) * 0.1
+        hot_hours = [int(h) for h in np.nonzero(penalty_coefs)[0]]
+        water_cost_per_hour = self.water_usage_per_hour * self.water_cost_per_gallon
+
+        # Objective: Minimize total cost
+        def objective_rule(model):
+            electricity_cost = pyo.quicksum(
+                model.total_load[h] * model.price[h] / 1000
+                for h in model.hours
+            )
+
+            water_cost = 0
+            if water_cost_per_hour:
+                water_cost = pyo.quicksum(
+                    model.use_water[h] * water_cost_per_hour
+                    for h in model.hours
+                )
+
+            temp_penalty = pyo.quicksum(
+                (1 - model.use_water[h]) * float(penalty_coefs[h])
+                for h in hot_hours
+            )
+
+            return electricity_cost + water_cost + temp_penalty
+
+        model.objective = pyo.Objective(rule=objective_rule, sense=pyo.minimize)
+
+        self.model = model
+        return model
 
+    def _build_structure(self) -> pyo.ConcreteModel:
+        """Build the sets, variables and constraints shared by every input set."""
         model = pyo.ConcreteModel()
 
         # Sets
         model.hours = pyo.RangeSet(0, 23)
 
-        # Parameters
-        model.temp = pyo.Param(model.hours, initialize=dict(enumerate(temperatures)))
-        model.price = pyo.Param(model.hours, initialize=dict(enumerate(electricity_prices)))
+        # Parameters (mutable so a rebuild only changes values, not structure)
+        model.temp = pyo.Param(model.hours, initialize=0.0, mutable=True)
+        model.price = pyo.Param(model.hours, initialize=0.0, mutable=True)
 
         # Decision Variables
         # Flexible load at each hour
@@ -98,7 +196,7 @@ class LinearDataCenterOptimizer:
         # Constraints
         # 1. Must complete all batch processing
         model.batch_completion = pyo.Constraint(
-            expr=sum(model.batch_load[h] for h in model.hours) >= self.flexible_load_mw * 8
+            expr=pyo.quicksum(model.batch_load[h] for h in model.hours) >= self.flexible_load_mw * 8
         )
 
         # 2. Calculate total electricity load (linearized)
@@ -120,50 +218,54 @@ class LinearDataCenterOptimizer:
         # 4. Prefer water cooling when hot (soft constraint via objective)
         # No hard constraint to keep it linear
 
-        # Objective: Minimize total cost
-        def objective_rule(model):
-            electricity_cost = sum(
-                model.total_load[h] * model.price[h] / 1000
-                for h in model.hours
-            )
-
-            water_cost = sum(
-                model.use_water[h] * self.water_usage_per_hour * self.water_cost_per_gallon
-                for h in model.hours
-            )
-
-            # Add penalty for not using water cooling when hot
-            temp_penalty = sum(
-                (1 - model.use_water[h]) * max(0, model.temp[h] - 95) * 0.1
-                for h in model.hours
-            )
-
-            return electricity_cost + water_cost + temp_penalty
-
-        model.objective = pyo.Objective(rule=objective_rule, sense=pyo.minimize)
-
-        self.model = model
         return model
 
     def solve(self, solver_name: str = 'highs') -> Dict:
-        """Solve the linear model."""
+        """Solve the linear model.
+
+        Falls back through SOLVER_FALLBACKS if solver_name is not installed.
+        """
         if self.model is None:
             raise ValueError("Model not built. Call build_model() first.")
 
-        solver = SolverFactory(solver_name)
+        # Callers get a copy, so edits to it can't leak into the cached solution
+        requested = solver_name
+        self.last_solve_cached = bool(self.results) and self._solved_key == (self._model_key, requested)
+        if self.last_solve_cached:
+            print("✅ Inputs unchanged since last solve, reusing solution")
+            return copy.deepcopy(self.results)
+
+        if solver_name not in self._solvers:
+            for name in dict.fromkeys((solver_name,) + SOLVER_FALLBACKS):
+                try:
+                    candidate = SolverFactory(name)
+                    if candidate.available(exception_flag=False):
+                        self._solvers[solver_name] = (name, candidate)
+                        break
+                except Exception:
+                    continue
+            else:
+                raise RuntimeError(f"Solver {solver_name} not available")
 
-        if solver.available():
-            print(f"Solving with {solver_name}...")
-            results = solver.solve(self.model, tee=False)
+        solver_name, solver = self._solvers[solver_name]
 
-            if results.solver.termination_condition == pyo.TerminationCondition.optimal:
-                print("✅ Optimal solution found!")
-                self.results = self._extract_results()
-                return self.results
-            else:
-                print(f"Solution status: {results.solver.termination_condition}")
+        # The reused model still holds the previous optimum; solvers that take
+        # a MIP start (e.g. cbc, gurobi, cplex) begin from it. appsi_highs keeps
+        # its loaded problem between solves without this
+        solve_kwargs = {'tee': False}
+        if self.results and getattr(solver, 'warm_start_capable', lambda: False)():
+            solve_kwargs['warmstart'] = True
+
+        print(f"Solving with {solver_name}...")
+        results = solver.solve(self.model, **solve_kwargs)
+
+        if results.solver.termination_condition == pyo.TerminationCondition.optimal:
+            print("✅ Optimal solution found!")
+            self.results = self._extract_results()
+            self._solved_key = (self._model_key, requested)
+            return copy.deepcopy(self.results)
         else:
-            raise RuntimeError(f"Solver {solver_name} not available")
+            print(f"Solution status: {results.solver.termination_condition}")
 
         return {}
 
@@ -187,6 +289,10 @@ class LinearDataCenterOptimizer:
         total_water_cost = 0
         total_water_used = 0
         peak_demand = 0
+        total_batch_load = 0
+        t_min = float('inf')
+        t_max = float('-inf')
+        t_sum = 0
 
         # Store temperature and price data
         temperatures = []
@@ -223,11 +329,18 @@ class LinearDataCenterOptimizer:
             total_water_cost += water_cost
             total_water_used += water_usage_scaled
             peak_demand = max(peak_demand, total_load_scaled)
+            total_batch_load += batch_load_scaled
+
+            # Running temperature stats so no extra passes are needed below
+            temp = hourly['temperature']
+            t_min = min(t_min, temp)
+            t_max = max(t_max, temp)
+            t_sum += temp
 
             # Store for arrays
             results['batch_load'].append(batch_load_scaled)
             results['cooling_mode'].append('water' if water_cooling else 'electric')
-            temperatures.append(hourly['temperature'])
+            temperatures.append(temp)
             prices.append(hourly['electricity_price'])
             results['hourly_costs'].append(elec_cost + water_cost)
             results['water_usage'].append(water_usage_scaled)
@@ -239,12 +352,10 @@ class LinearDataCenterOptimizer:
         results['electricity_prices'] = prices
 
         # Calculate baseline (no optimization) at requested scale
-        avg_price = np.mean(self.electricity_prices) if hasattr(self, 'electricity_prices') and self.electricity_prices else 70
-        # Scale baseline components
+        prices_arr = np.asarray(self.electricity_prices if self.electricity_prices is not None else [], dtype=float)
+        avg_price = float(prices_arr.mean()) if prices_arr.size else 70
+        baseline_cost = self._baseline_coef * avg_price
         critical_scaled = self.critical_load_mw * self.scale_factor
-        flexible_scaled = self.flexible_load_mw * self.scale_factor
-        chiller_scaled = self.chiller_energy * self.scale_factor
-        baseline_cost = (critical_scaled + flexible_scaled/3 + chiller_scaled) * 24 * avg_price / 1000
 
         results['summary'] = {
             'total_cost': total_elec_cost + total_water_cost,
@@ -277,12 +388,12 @@ class LinearDataCenterOptimizer:
         results['cost_savings_percent'] = results['savings']['percentage_saved']
         results['total_water_gallons'] = total_water_used
         results['peak_demand'] = peak_demand
-        results['average_load'] = sum(results['batch_load']) / len(results['batch_load']) + critical_scaled
+        results['average_load'] = total_batch_load / len(temperatures) + critical_scaled
         results['water_saved'] = results['environmental']['water_saved_gallons']
         results['carbon_avoided'] = results['environmental']['carbon_avoided_tons']
-        results['max_temp'] = max(temperatures)
-        results['min_temp'] = min(temperatures)
-        results['avg_temp'] = sum(temperatures) / len(temperatures)
+        results['max_temp'] = t_max
+        results['min_temp'] = t_min
+        results['avg_temp'] = t_sum / len(temperatures)
         results['status'] = 'completed'
         results['solver_time'] = 0  # Will be updated if we track it
 
@@ -337,8 +448,12 @@ class LinearDataCenterOptimizer:
         self.build_model(temperatures, prices)
         results = self.solve(solver_name)
 
-        # Save to Supabase if available
-        if results and self.data_interface:
-            self.save_results_to_supabase()
+        # Save to Supabase if available, unless this reused solution already
+        # has a run; one from a bare solve() or a failed save is saved now
+        already_saved = self.last_solve_cached and self.results.get('run_id')
+        if results and self.data_interface and not already_saved:
+            run_id = self.save_results_to_supabase()
+            if run_id:
+                results['run_id'] = run_id
 
         return results
\ No newline at end of file
@@ -4,8 +4,12 @@ Optimize Data Center with REAL Supabase Data
 Uses actual Arizona electricity prices and interchange data
 """
 
+import io
 import os
 import sys
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import psycopg2
 from psycopg2 import sql
 import numpy as np
@@ -14,19 +18,49 @@ from dotenv import load_dotenv
 
 # Add repo root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from data.api.store_to_postgres import connect_db
+from data.api.store_to_postgres import get_conn
 from model.optimizer_linear import LinearDataCenterOptimizer
 
 load_dotenv()
 
+# Hour-of-day masks for the interchange-based price multipliers
+HOURS = np.arange(24)
+PEAK_PRICE_HOURS = (HOURS >= 15) & (HOURS <= 20)     # 3-8 PM
+OFF_PEAK_PRICE_HOURS = (HOURS >= 22) | (HOURS < 6)
+
+# Typical Phoenix summer (June-August) day, used when a date has no weather
+# data; piecewise needs a float input since the output keeps its dtype
+_h = HOURS.astype(float)
+SUMMER_TEMP_PROFILE = np.piecewise(
+    _h,
+    [_h <= 5, (_h > 5) & (_h <= 10), (_h > 10) & (_h <= 16), (_h > 16) & (_h <= 20), _h > 20],
+    [lambda h: 92 + h * 1.5,          # Rising from 92°F at night
+     lambda h: 100 + (h - 5) * 3,     # Rising quickly in morning
+     lambda h: 115 + (h - 10) * 0.3,  # Peak heat 115-117°F
+     lambda h: 117 - (h - 16) * 3,    # Cooling after sunset
+     lambda h: 105 - (h - 20) * 3]    # Night cooling
+)
+del _h
+
 def fetch_real_prices(conn, date_str=None):
     """Fetch real electricity prices from Supabase."""
+    # Get monthly price
+    price_query = """
+    SELECT AVG(price_per_mwh)::float8 as avg_price
+    FROM eia_az_price
+    WHERE sectorid = 'ALL';
+    """
+    cur = conn.cursor()
+    cur.execute(price_query)
+    base_price = cur.fetchone()[0] or 128.4  # Default from your data
+    cur.close()
+
     if date_str:
         # Get prices for a specific date
         query = """
         SELECT
-            EXTRACT(HOUR FROM period) as hour,
-            AVG(value) as avg_interchange_mw,
+            EXTRACT(HOUR FROM period)::int as hour,
+            AVG(value)::float8 as avg_interchange_mw,
             COUNT(*) as data_points
         FROM eia_interchange
         WHERE DATE(period) = %s
@@ -41,9 +75,9 @@ def fetch_real_prices(conn, date_str=None):
         # Get average hourly patterns
         query = """
         SELECT
-            EXTRACT(HOUR FROM period) as hour,
-            AVG(value) as avg_interchange_mw,
-            STDDEV(value) as std_interchange_mw,
+            EXTRACT(HOUR FROM period)::int as hour,
+            AVG(value)::float8 as avg_interchange_mw,
+            STDDEV(value)::float8 as std_interchange_mw,
             COUNT(*) as data_points
         FROM eia_interchange
         WHERE fromba IN ('AZPS', 'SRP', 'TEPC')
@@ -54,51 +88,36 @@ def fetch_real_prices(conn, date_str=None):
         cur = conn.cursor()
         cur.execute(query)
 
-    hourly_data = cur.fetchall()
-    cur.close()
-
-    # Get monthly price
-    price_query = """
-    SELECT AVG(price_per_mwh) as avg_price
-    FROM eia_az_price
-    WHERE sectorid = 'ALL';
-    """
-    cur = conn.cursor()
-    cur.execute(price_query)
-    base_price = cur.fetchone()[0] or 128.4  # Default from your data
-    cur.close()
-
     # Create hourly prices based on interchange patterns
     # Higher interchange = higher demand = higher prices
-    hourly_prices = []
-    for hour_data in hourly_data:
-        hour = int(hour_data[0])
-        interchange = float(hour_data[1] or 0)  # Convert Decimal to float
-
-        # Price varies based on interchange/demand
-        # Normalize interchange to create price multiplier
-        if hour >= 15 and hour <= 20:  # Peak hours 3-8 PM
-            price_mult = 1.3 + (interchange / 10000) * 0.2  # Higher during peak
-        elif hour >= 22 or hour < 6:  # Off-peak
-            price_mult = 0.6 + (interchange / 10000) * 0.1
-        else:
-            price_mult = 1.0 + (interchange / 10000) * 0.15
-
-        hourly_prices.append(float(base_price) * price_mult)  # Convert base_price too
-
-    # Ensure we have 24 hours
-    while len(hourly_prices) < 24:
-        hourly_prices.append(float(base_price))
+    # Hours with no interchange data keep the base price
+    hourly_prices = np.full(24, base_price)
+    # Rows stream off the cursor straight into the arrays (no fetchall list)
+    rows = np.fromiter(((row[0], row[1] or 0.0) for row in cur),
+                       dtype=[('hour', np.intp), ('interchange', np.float64)])
+    cur.close()
+    hours = rows['hour']
+
+    # Price varies based on interchange/demand
+    # Normalize interchange to create price multiplier
+    scaled = rows['interchange'] / 10000
+    price_mult = np.select(
+        [PEAK_PRICE_HOURS[hours], OFF_PEAK_PRICE_HOURS[hours]],
+        [1.3 + scaled * 0.2,              # Higher during peak
+         0.6 + scaled * 0.1],
+        default=1.0 + scaled * 0.15
+    )
+    hourly_prices[hours] = base_price * price_mult
 
-    return hourly_prices[:24]
+    return hourly_prices.tolist()
 
 def fetch_real_temperatures(conn, date_str=None):
     """Fetch real temperature data or use typical Phoenix pattern."""
     if date_str:
         query = """
         SELECT
-            EXTRACT(HOUR FROM timestamp) as hour,
-            AVG(temperature_f) as avg_temp
+            EXTRACT(HOUR FROM timestamp)::int as hour,
+            AVG(temperature_f)::float8 as avg_temp
         FROM weather_data
         WHERE DATE(timestamp) = %s
         GROUP BY EXTRACT(HOUR FROM timestamp)
@@ -106,36 +125,25 @@ def fetch_real_temperatures(conn, date_str=None):
         """
         cur = conn.cursor()
         cur.execute(query, (date_str,))
-        temp_data = cur.fetchall()
+
+        # Fill missing hours with the default Phoenix temp
+        temperatures = np.full(24, 95.0)
+        found = False
+        for hour, avg_temp in cur:
+            temperatures[hour] = avg_temp
+            found = True
         cur.close()
 
-        if temp_data and len(temp_data) > 0:
-            temperatures = [float(row[1]) for row in temp_data]
-            # Fill missing hours
-            while len(temperatures) < 24:
-                temperatures.append(95.0)  # Default Phoenix temp
-            return temperatures[:24]
-
-    # Use typical Phoenix summer pattern if no real data
-    temperatures = []
-    for hour in range(24):
-        # Phoenix summer temperature pattern (June-August)
-        if hour <= 5:
-            temp = 92 + hour * 1.5  # Rising from 92°F at night
-        elif hour <= 10:
-            temp = 100 + (hour - 5) * 3  # Rising quickly in morning
-        elif hour <= 16:
-            temp = 115 + (hour - 10) * 0.3  # Peak heat 115-117°F
-        elif hour <= 20:
-            temp = 117 - (hour - 16) * 3  # Cooling after sunset
-        else:
-            temp = 105 - (hour - 20) * 3  # Night cooling
-
-        # Add some variation
-        temp += np.random.uniform(-2, 2)
-        temperatures.append(max(85, min(118, temp)))
-
-    return temperatures
+        if found:
+            return temperatures.tolist()
+
+    # Use typical Phoenix summer pattern if no real data, with some variation;
+    # seeded by the date so a date always gets the same day
+    date_digits = (date_str or '').replace('-', '')
+    rng = np.random.default_rng(int(date_digits) if date_digits.isdigit() else None)
+    temperatures = SUMMER_TEMP_PROFILE + rng.uniform(-2, 2, size=24)
+
+    return np.clip(temperatures, 85, 118).tolist()
 
 def get_interchange_summary(conn):
     """Get summary of Arizona interchange data."""
@@ -157,7 +165,7 @@ def get_interchange_summary(conn):
     SELECT
         direction,
         COUNT(*) as records,
-        AVG(value) as avg_mw,
+        AVG(value)::float8 as avg_mw,
         MAX(value) as max_mw,
         MIN(value) as min_mw
     FROM az_interchange
@@ -178,96 +186,122 @@ def get_interchange_summary(conn):
             print(f"  Average: {avg_mw:.1f} MW")
             print(f"  Range: {min_mw:.1f} - {max_mw:.1f} MW")
 
-def run_optimization_with_real_data(conn, target_date=None):
-    """Run optimization using real data from Supabase."""
-    print("\n" + "=" * 80)
-    print("DATA CENTER OPTIMIZATION WITH REAL ARIZONA DATA")
-    print("=" * 80)
-
-    # Fetch real data
-    print("\n📡 Fetching real data from Supabase...")
-    prices = fetch_real_prices(conn, target_date)
-    temperatures = fetch_real_temperatures(conn, target_date)
+def format_input_report(temperatures, prices):
+    """Format the fetched 24-hour inputs as a single printable report."""
+    buf = io.StringIO()
+    w = buf.write
 
-    print(f"\n📊 Real Data Summary:")
-    print(f"  Temperature range: {min(temperatures):.1f}°F - {max(temperatures):.1f}°F")
-    print(f"  Price range: ${min(prices):.2f} - ${max(prices):.2f}/MWh")
-    print(f"  Average price: ${np.mean(prices):.2f}/MWh")
+    w("\n📊 Real Data Summary:\n")
+    w(f"  Temperature range: {min(temperatures):.1f}°F - {max(temperatures):.1f}°F\n")
+    w(f"  Price range: ${min(prices):.2f} - ${max(prices):.2f}/MWh\n")
+    w(f"  Average price: ${np.mean(prices):.2f}/MWh\n")
 
     # Show hourly data
-    print("\n🕐 Hourly Data (24-hour profile):")
-    print("Hour | Temp (°F) | Price ($/MWh)")
-    print("-----|-----------|-------------")
+    w("\n🕐 Hourly Data (24-hour profile):\n")
+    w("Hour | Temp (°F) | Price ($/MWh)\n")
+    w("-----|-----------|-------------\n")
     for h in range(24):
         temp_bar = "🔥" if temperatures[h] > 100 else "☀️" if temperatures[h] > 85 else "🌤️"
         price_bar = "📈" if prices[h] > 150 else "➖" if prices[h] > 100 else "📉"
-        print(f" {h:2d}  | {temperatures[h]:6.1f} {temp_bar} | ${prices[h]:6.2f} {price_bar}")
+        w(f" {h:2d}  | {temperatures[h]:6.1f} {temp_bar} | ${prices[h]:6.2f} {price_bar}\n")
 
-    # Initialize optimizer
-    print("\n🔧 Initializing optimizer with real data...")
-    optimizer = LinearDataCenterOptimizer()
+    return buf.getvalue()
 
-    # Build and solve model
-    print("🏗️ Building optimization model...")
-    model = optimizer.build_model(temperatures, prices)
+def format_results_report(results):
+    """Format optimization results and the cooling schedule as a single report."""
+    buf = io.StringIO()
+    w = buf.write
 
-    print("🔍 Solving optimization problem...")
-    try:
-        # Try HiGHS first (works better on Windows), then GLPK
-        results = optimizer.solve(solver_name='highs')
+    w("\n" + "=" * 80 + "\n")
+    w("OPTIMIZATION RESULTS WITH REAL DATA\n")
+    w("=" * 80 + "\n")
 
-        # Display results
-        print("\n" + "=" * 80)
-        print("OPTIMIZATION RESULTS WITH REAL DATA")
-        print("=" * 80)
+    w(f"\n💰 COST ANALYSIS:\n")
+    w(f"  Total Daily Cost: ${results['summary']['total_cost']:,.2f}\n")
+    w(f"  Electricity Cost: ${results['summary']['electricity_cost']:,.2f}\n")
+    w(f"  Water Cost: ${results['summary']['water_cost']:,.2f}\n")
 
-        print(f"\n💰 COST ANALYSIS:")
-        print(f"  Total Daily Cost: ${results['summary']['total_cost']:,.2f}")
-        print(f"  Electricity Cost: ${results['summary']['electricity_cost']:,.2f}")
-        print(f"  Water Cost: ${results['summary']['water_cost']:,.2f}")
+    w(f"\n💡 SAVINGS:\n")
+    w(f"  Daily Savings: ${results['savings']['daily_savings']:,.2f}\n")
+    w(f"  Annual Savings: ${results['savings']['annual_savings']:,.2f}\n")
+    w(f"  Percentage Saved: {results['savings']['percentage_saved']:.1f}%\n")
 
-        print(f"\n💡 SAVINGS:")
-        print(f"  Daily Savings: ${results['savings']['daily_savings']:,.2f}")
-        print(f"  Annual Savings: ${results['savings']['annual_savings']:,.2f}")
-        print(f"  Percentage Saved: {results['savings']['percentage_saved']:.1f}%")
+    w(f"\n💧 WATER IMPACT:\n")
+    w(f"  Water Used: {results['environmental']['water_used_gallons']:,.0f} gallons/day\n")
+    w(f"  Water Saved: {results['environmental']['water_saved_gallons']:,.0f} gallons/day\n")
 
-        print(f"\n💧 WATER IMPACT:")
-        print(f"  Water Used: {results['environmental']['water_used_gallons']:,.0f} gallons/day")
-        print(f"  Water Saved: {results['environmental']['water_saved_gallons']:,.0f} gallons/day")
+    w(f"\n⚡ ELECTRICITY:\n")
+    w(f"  Peak Demand: {results['summary']['peak_demand_mw']:.1f} MW\n")
+    w(f"  Peak Reduction: {results['environmental']['peak_reduction_mw']:.1f} MW\n")
 
-        print(f"\n⚡ ELECTRICITY:")
-        print(f"  Peak Demand: {results['summary']['peak_demand_mw']:.1f} MW")
-        print(f"  Peak Reduction: {results['environmental']['peak_reduction_mw']:.1f} MW")
+    w(f"\n🌱 ENVIRONMENTAL:\n")
+    w(f"  Carbon Avoided: {results['environmental']['carbon_avoided_tons']:.2f} tons CO2/day\n")
+    w(f"  Annual Carbon Reduction: {results['environmental']['carbon_avoided_tons'] * 365:.1f} tons CO2/year\n")
 
-        print(f"\n🌱 ENVIRONMENTAL:")
-        print(f"  Carbon Avoided: {results['environmental']['carbon_avoided_tons']:.2f} tons CO2/day")
-        print(f"  Annual Carbon Reduction: {results['environmental']['carbon_avoided_tons'] * 365:.1f} tons CO2/year")
+    # Show optimization schedule
+    w(f"\n📅 OPTIMAL COOLING SCHEDULE:\n")
+    w("Hour | Load (MW) | Cooling Mode | Cost\n")
+    w("-----|-----------|--------------|--------\n")
 
-        # Show optimization schedule
-        print(f"\n📅 OPTIMAL COOLING SCHEDULE:")
-        print("Hour | Load (MW) | Cooling Mode | Cost")
-        print("-----|-----------|--------------|--------")
+    total_water_hours = 0
 
-        total_water_hours = 0
-        total_chiller_hours = 0
+    for h in range(24):
+        data = results['hourly_data'][h]
+        cooling = "💧 Water" if data['water_cooling'] else "❄️ Chiller"
+        if data['water_cooling']:
+            total_water_hours += 1
+
+        cost = data['electricity_cost'] + data['water_cost']
+        w(f" {h:2d}  | {data['batch_load_mw']:7.1f}  | {cooling:12s} | ${cost:6.2f}\n")
 
-        for h in range(24):
-            data = results['hourly_data'][h]
-            cooling = "💧 Water" if data['water_cooling'] else "❄️ Chiller"
-            if data['water_cooling']:
-                total_water_hours += 1
-            else:
-                total_chiller_hours += 1
+    total_chiller_hours = 24 - total_water_hours
+    w(f"\n📊 COOLING MODE SUMMARY:\n")
+    w(f"  Water Cooling: {total_water_hours} hours ({total_water_hours/24*100:.0f}%)\n")
+    w(f"  Chiller Cooling: {total_chiller_hours} hours ({total_chiller_hours/24*100:.0f}%)\n")
 
-            cost = data['electricity_cost'] + data['water_cost']
-            print(f" {h:2d}  | {data['batch_load_mw']:7.1f}  | {cooling:12s} | ${cost:6.2f}")
+    return buf.getvalue()
 
-        print(f"\n📊 COOLING MODE SUMMARY:")
-        print(f"  Water Cooling: {total_water_hours} hours ({total_water_hours/24*100:.0f}%)")
-        print(f"  Chiller Cooling: {total_chiller_hours} hours ({total_chiller_hours/24*100:.0f}%)")
+def run_optimization_with_real_data(conn, target_date=None, verbose=True, save=True):
+    """Run optimization using real data from Supabase.
+
+    Set verbose=False to skip all report formatting, e.g. in batch runs.
+    Set save=False to leave storing the results to the caller.
+    """
+    if verbose:
+        print("\n" + "=" * 80)
+        print("DATA CENTER OPTIMIZATION WITH REAL ARIZONA DATA")
+        print("=" * 80)
+
+        # Fetch real data
+        print("\n📡 Fetching real data from Supabase...")
+    prices = fetch_real_prices(conn, target_date)
+    temperatures = fetch_real_temperatures(conn, target_date)
+
+    if verbose:
+        sys.stdout.write(format_input_report(temperatures, prices))
+
+        # Initialize optimizer
+        print("\n🔧 Initializing optimizer with real data...")
+    optimizer = LinearDataCenterOptimizer()
+
+    # Build and solve model
+    if verbose:
+        print("🏗️ Building optimization model...")
+    model = optimizer.build_model(temperatures, prices)
+
+    if verbose:
+        print("🔍 Solving optimization problem...")
+    try:
+        # Try HiGHS first (works better on Windows), then GLPK
+        results = optimizer.solve(solver_name='highs')
+
+        # Display results
+        if verbose:
+            sys.stdout.write(format_results_report(results))
 
         # Save results to database
-        save_optimization_results(conn, results, target_date)
+        if save:
+            save_optimization_results(conn, results, target_date)
 
         return results
 
@@ -321,18 +355,76 @@ def save_optimization_results(conn, results, date_str):
     except Exception as e:
         print(f"\n⚠️ Could not save to database: {e}")
 
+def _backtest_worker(target_date):
+    """Optimize one date in a worker process using that process's own pool.
+
+    Errors are reported and give (target_date, None), so one bad date doesn't
+    discard the results of the others.
+    """
+    try:
+        with get_conn() as conn:
+            return target_date, run_optimization_with_real_data(
+                conn, target_date, verbose=False, save=False
+            )
+    except Exception as e:
+        print(f"⚠️ Backtest for {target_date} failed: {e}")
+        return target_date, None
+
+def run_backtest(dates, workers=None):
+    """Optimize independent dates in parallel and store all results at the end.
+
+    Workers are spawned rather than forked so no psycopg2 connection is
+    shared with the parent process.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    workers = workers or os.cpu_count()
+    # Hand each worker several dates per round trip on long (e.g. annual) runs
+    chunksize = max(1, len(dates) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+        completed = list(ex.map(_backtest_worker, dates, chunksize=chunksize))
+
+    print("\n📅 BACKTEST RESULTS:")
+    print("Date       | Total Cost   | Daily Savings | Saved")
+    print("-----------|--------------|---------------|------")
+    with get_conn() as conn:
+        for target_date, results in completed:
+            if not results:
+                print(f"{target_date} | optimization failed")
+                continue
+            print(
+                f"{target_date} | ${results['summary']['total_cost']:>11,.2f} "
+                f"| ${results['savings']['daily_savings']:>12,.2f} "
+                f"| {results['savings']['percentage_saved']:4.1f}%"
+            )
+            save_optimization_results(conn, results, target_date)
+
+    return [results for _, results in completed]
+
 def main():
+    parser = argparse.ArgumentParser(description="Optimize the data center with real Supabase data.")
+    parser.add_argument("--date", help="Optimize a single date YYYY-MM-DD (default: average patterns)")
+    parser.add_argument("--start-date", help="First date YYYY-MM-DD of a multi-date backtest")
+    parser.add_argument("--days", type=int, default=1, help="Number of days to backtest (with --start-date)")
+    parser.add_argument("--workers", type=int, help="Backtest worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.start_date:
+        start = datetime.strptime(args.start_date, "%Y-%m-%d")
+        dates = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(args.days)]
+        print(f"🔁 Backtesting {len(dates)} day(s) from {dates[0]} to {dates[-1]}...")
+        run_backtest(dates, args.workers)
+        return
+
     # Connect to database
     print("🔌 Connecting to Supabase...")
-    conn = connect_db()
+    with get_conn() as conn:
+        # Get interchange summary
+        get_interchange_summary(conn)
 
-    # Get interchange summary
-    get_interchange_summary(conn)
-
-    # Run optimization with real data
-    # You can specify a date or use None for average patterns
-    target_date = None  # Use average patterns for more typical results
-    results = run_optimization_with_real_data(conn, target_date)
+        # Run optimization with real data
+        # Without --date, average patterns give more typical results
+        target_date = args.date
+        results = run_optimization_with_real_data(conn, target_date)
 
     if results:
         print("\n" + "=" * 80)
@@ -344,8 +436,5 @@ def main():
         print(f"• Water conservation: {results['environmental']['water_saved_gallons']*365:,.0f} gallons/year")
         print(f"• Carbon reduction: {results['environmental']['carbon_avoided_tons']*365:.0f} tons CO2/year")
 
-    # Close connection
-    conn.close()
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
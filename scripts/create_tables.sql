@@ -91,6 +91,13 @@ CREATE INDEX IF NOT EXISTS idx_eia_interchange_date ON eia_interchange(DATE(peri
 CREATE INDEX IF NOT EXISTS idx_eia_az_price_period ON eia_az_price(period_month);
 CREATE INDEX IF NOT EXISTS idx_eia_az_price_sector ON eia_az_price(sectorid);
 
+-- 8. BLS Water/Sewer CPI Index (loaded by scripts/fetch_water_index.py)
+CREATE TABLE IF NOT EXISTS water_price_index (
+    period_date DATE PRIMARY KEY,
+    cpi_value NUMERIC NOT NULL,
+    series_id TEXT NOT NULL
+);
+
 -- Grant necessary permissions (adjust as needed)
 GRANT ALL ON ALL TABLES IN SCHEMA public TO authenticated;
 GRANT ALL ON ALL SEQUENCES IN SCHEMA public TO authenticated;
@@ -12,32 +12,38 @@ from dotenv import load_dotenv
 
 # Add repo root to path (go up 2 levels from scripts/dev/)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from data.api.store_to_postgres import connect_db
+from data.api.store_to_postgres import get_conn
 
 load_dotenv()
 
 def check_schema():
-    conn = connect_db()
-    cur = conn.cursor()
-
-    # Check optimization_results columns
-    query = """
-    SELECT column_name, data_type, is_nullable
-    FROM information_schema.columns
-    WHERE table_name = 'optimization_results'
-    ORDER BY ordinal_position;
-    """
-
-    cur.execute(query)
-    columns = cur.fetchall()
-
-    print("optimization_results table columns:")
-    print("-" * 50)
-    for col_name, data_type, nullable in columns:
-        print(f"{col_name:30} {data_type:20} {nullable}")
-
-    cur.close()
-    conn.close()
+    with get_conn() as conn:
+        cur = conn.cursor()
+
+        # Check optimization_results columns
+        # pg_catalog directly avoids the joins behind information_schema.columns;
+        # to_regclass returns NULL (no rows) if the table does not exist
+        query = """
+        SELECT
+            attname AS column_name,
+            format_type(atttypid, atttypmod) AS data_type,
+            CASE WHEN attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable
+        FROM pg_catalog.pg_attribute
+        WHERE attrelid = to_regclass('optimization_results')
+          AND attnum > 0
+          AND NOT attisdropped
+        ORDER BY attnum;
+        """
+
+        cur.execute(query)
+        columns = cur.fetchall()
+
+        print("optimization_results table columns:")
+        print("-" * 50)
+        for col_name, data_type, nullable in columns:
+            print(f"{col_name:30} {data_type:20} {nullable}")
+
+        cur.close()
 
 if __name__ == "__main__":
     check_schema()
\ No newline at end of file
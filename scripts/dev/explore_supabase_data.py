@@ -7,21 +7,28 @@ Useful for new developers to understand the data schema.
 Run from repo root: python scripts/dev/explore_supabase_data.py
 """
 
+import argparse
+import csv
 import os
+import sqlite3
 import sys
+import time
 import psycopg2
 from psycopg2 import sql
-import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime
 import json
 
 # Add repo root to path (go up 2 levels from scripts/dev/)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from data.api.store_to_postgres import connect_db
+from data.api.store_to_postgres import get_pool
 
 load_dotenv()
 
+# Local cache of table list, structure and approximate counts between runs
+CACHE_PATH = os.path.expanduser("~/.cache/cooling-cloud/schema.sqlite")
+CACHE_TTL_SECONDS = 600
+
 def get_all_tables(conn):
     """Get list of all tables in the database."""
     query = """
@@ -36,65 +43,260 @@ def get_all_tables(conn):
     cur.close()
     return tables
 
-def get_table_structure(conn, table_name):
-    """Get the structure of a table."""
+def get_all_table_structures(conn, tables):
+    """Get the structure of every table in one query, keyed by table name."""
     query = """
     SELECT
+        table_name,
         column_name,
         data_type,
         character_maximum_length,
         is_nullable
     FROM information_schema.columns
-    WHERE table_name = %s
-    ORDER BY ordinal_position;
+    WHERE table_schema = 'public'
+      AND table_name = ANY(%s)
+    ORDER BY table_name, ordinal_position;
+    """
+    cur = conn.cursor()
+    cur.execute(query, (list(tables),))
+    structures = {table: [] for table in tables}
+    for table_name, *column in cur:
+        structures[table_name].append(tuple(column))
+    cur.close()
+    return structures
+
+def fetch_rows(conn, query, params=None, name="explore", chunk_size=1000):
+    """Run a query on a server-side cursor and return (columns, rows).
+
+    Rows are pulled in chunks with fetchmany so large results are never
+    buffered client-side in one piece.
+    """
+    cur = conn.cursor(name=name)
+    cur.itersize = chunk_size
+    try:
+        cur.execute(query, params)
+        rows = []
+        while True:
+            chunk = cur.fetchmany(chunk_size)
+            if not chunk:
+                break
+            rows.extend(chunk)
+        columns = [d[0] for d in cur.description]
+    finally:
+        cur.close()
+    return columns, rows
+
+def copy_to_stdout(conn, query):
+    """Stream a query result to stdout as tab-separated CSV via COPY.
+
+    Postgres encodes the rows itself, so nothing is decoded into Python
+    objects on the way through.
+    """
+    copy_sql = sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER true, DELIMITER E'\\t')").format(
+        sql.SQL(query.strip().rstrip(';'))
+    )
+    cur = conn.cursor()
+    cur.copy_expert(copy_sql, sys.stdout)
+    cur.close()
+    sys.stdout.flush()
+
+def print_rows(columns, rows):
+    """Print a result set as tab-separated values with a header row."""
+    writer = csv.writer(sys.stdout, delimiter='\t', lineterminator='\n')
+    writer.writerow(columns)
+    writer.writerows(rows)
+
+# Per-table queries whose shape never changes; prepared once per session in main()
+PREPARED_STATEMENTS = {
+    "explore_approx_count": """
+        SELECT reltuples::bigint
+        FROM pg_class
+        WHERE oid = to_regclass('public.' || quote_ident($1)) AND relkind = 'r'
+    """,
+}
+
+def prepare_statements(conn):
+    """PREPARE the fixed per-table queries so the server parses and plans them once."""
+    cur = conn.cursor()
+    for name, query in PREPARED_STATEMENTS.items():
+        cur.execute(f"PREPARE {name} AS {query}")
+    cur.close()
+
+def deallocate_statements(conn):
+    """Drop the prepared statements before the connection goes back to the pool."""
+    cur = conn.cursor()
+    for name in PREPARED_STATEMENTS:
+        cur.execute(f"DEALLOCATE {name}")
+    cur.close()
+
+def get_table_approx_count(conn, table_name, prepared=False):
+    """Estimate the row count of a table from planner statistics.
+
+    Reads pg_class.reltuples of the public-schema table instead of scanning
+    it. Falls back to COUNT(*) when there is no estimate: never-analyzed
+    tables report -1 on PG14+ and 0 before that.
+    Pass prepared=True after prepare_statements() to reuse the server plan.
     """
     cur = conn.cursor()
-    cur.execute(query, (table_name,))
-    columns = cur.fetchall()
+    if prepared:
+        cur.execute("EXECUTE explore_approx_count(%s)", (table_name,))
+    else:
+        cur.execute("""
+            SELECT reltuples::bigint
+            FROM pg_class
+            WHERE oid = to_regclass('public.' || quote_ident(%s)) AND relkind = 'r';
+        """, (table_name,))
+    row = cur.fetchone()
+    if row is None or row[0] <= 0:
+        cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table_name)))
+        row = cur.fetchone()
     cur.close()
-    return columns
+    return row[0]
+
+def get_table_sample(conn, table_name, limit=10, prepared=False, count=None):
+    """Get sample rows from a table as (approx_count, columns, rows).
 
-def get_table_sample(conn, table_name, limit=10):
-    """Get sample data from a table."""
+    A known count (e.g. from the metadata cache) skips the count lookup.
+    """
     try:
         # Get count
-        count_query = sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table_name))
-        cur = conn.cursor()
-        cur.execute(count_query)
-        count = cur.fetchone()[0]
+        if count is None:
+            count = get_table_approx_count(conn, table_name, prepared=prepared)
 
         # Get sample
         sample_query = sql.SQL("SELECT * FROM {} LIMIT %s").format(sql.Identifier(table_name))
-        df = pd.read_sql_query(sample_query, conn, params=(limit,))
+        columns, rows = fetch_rows(conn, sample_query, (limit,), name=f"sample_{table_name}", chunk_size=limit)
 
-        cur.close()
-        return count, df
+        return count, columns, rows
     except Exception as e:
         print(f"Error reading {table_name}: {e}")
-        return 0, pd.DataFrame()
+        conn.rollback()
+        return 0, [], []
 
-def get_date_range(conn, table_name, date_column):
-    """Get the date range of data in a table."""
-    try:
-        query = sql.SQL("""
+def get_all_date_ranges(conn, date_columns):
+    """Get date ranges for several tables in one UNION ALL query.
+
+    date_columns maps table name -> date column. Returns a dict of
+    table name -> (min_date, max_date, unique_days). If the combined query
+    fails, each table is queried on its own so one bad table (e.g. a text
+    date column or missing permission) only drops its own range.
+    """
+    if not date_columns:
+        return {}
+    parts = [
+        sql.SQL("""
             SELECT
-                MIN({date_col}) as min_date,
-                MAX({date_col}) as max_date,
+                {name} as table_name,
+                MIN({date_col})::text as min_date,
+                MAX({date_col})::text as max_date,
                 COUNT(DISTINCT DATE({date_col})) as unique_days
             FROM {table}
         """).format(
-            date_col=sql.Identifier(date_column),
+            name=sql.Literal(table_name),
+            date_col=sql.Identifier(date_col),
             table=sql.Identifier(table_name)
         )
+        for table_name, date_col in date_columns.items()
+    ]
+    try:
         cur = conn.cursor()
-        cur.execute(query)
-        result = cur.fetchone()
+        cur.execute(sql.SQL(" UNION ALL ").join(parts))
+        ranges = {row[0]: row[1:] for row in cur.fetchall()}
         cur.close()
-        return result
+        return ranges
     except Exception as e:
-        return None, None, 0
+        print(f"Error reading date ranges together, retrying per table: {e}")
+        conn.rollback()
+
+    ranges = {}
+    for table_name, part in zip(date_columns, parts):
+        try:
+            cur = conn.cursor()
+            cur.execute(part)
+            row = cur.fetchone()
+            cur.close()
+            ranges[table_name] = row[1:]
+        except Exception as e:
+            print(f"Error reading date range of {table_name}: {e}")
+            conn.rollback()
+    return ranges
+
+def get_db_fingerprint(conn):
+    """Return (db_key, watermark) identifying the database and its current statistics.
+
+    The watermark changes when tables are added or dropped or when
+    reltuples moves, which invalidates cached metadata before the TTL.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT
+            current_database() || '@' || COALESCE(host(inet_server_addr()), 'local')
+                || ':' || COALESCE(inet_server_port(), 0)
+                || '/' || current_setting('server_version_num'),
+            (SELECT COUNT(*) || ':' || COALESCE(SUM(c.reltuples), 0)::bigint
+             FROM pg_class c
+             JOIN pg_namespace n ON n.oid = c.relnamespace
+             WHERE n.nspname = 'public' AND c.relkind = 'r');
+    """)
+    db_key, watermark = cur.fetchone()
+    cur.close()
+    return db_key, watermark
+
+def open_metadata_cache():
+    """Open (and create if needed) the local SQLite metadata cache, or None if unavailable."""
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        cache = sqlite3.connect(CACHE_PATH)
+        cache.execute("""
+            CREATE TABLE IF NOT EXISTS table_metadata (
+                db_key TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                columns_json TEXT NOT NULL,
+                approx_count INTEGER NOT NULL,
+                watermark TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (db_key, table_name)
+            )
+        """)
+        return cache
+    except (OSError, sqlite3.Error) as e:
+        print(f"Metadata cache unavailable: {e}")
+        return None
+
+def load_cached_metadata(cache, db_key, watermark):
+    """Return (tables, structures, counts) from the cache, or None on a miss."""
+    rows = cache.execute("""
+        SELECT table_name, columns_json, approx_count
+        FROM table_metadata
+        WHERE db_key = ? AND watermark = ? AND fetched_at > ?
+        ORDER BY table_name
+    """, (db_key, watermark, time.time() - CACHE_TTL_SECONDS)).fetchall()
+    if not rows:
+        return None
+    tables = [row[0] for row in rows]
+    structures = {row[0]: [tuple(col) for col in json.loads(row[1])] for row in rows}
+    counts = {row[0]: row[2] for row in rows}
+    return tables, structures, counts
+
+def save_cached_metadata(cache, db_key, watermark, structures, counts):
+    """Replace the cached metadata for this database."""
+    fetched_at = time.time()
+    with cache:
+        cache.execute("DELETE FROM table_metadata WHERE db_key = ?", (db_key,))
+        cache.executemany("""
+            INSERT INTO table_metadata
+                (db_key, table_name, columns_json, approx_count, watermark, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (db_key, table, json.dumps(columns), counts[table], watermark, fetched_at)
+            for table, columns in structures.items()
+        ])
 
 def main():
+    parser = argparse.ArgumentParser(description="Explore Supabase tables, structure and sample data.")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and refresh the local metadata cache")
+    args = parser.parse_args()
+
     print("=" * 80)
     print("SUPABASE DATABASE EXPLORER")
     print("=" * 80)
@@ -102,15 +304,29 @@ def main():
     # Connect to database
     print("\n🔌 Connecting to Supabase...")
     try:
-        conn = connect_db()
+        pool = get_pool()
+        conn = pool.getconn()
         print("✅ Connected successfully!")
     except Exception as e:
         print(f"❌ Connection failed: {e}")
         return
 
+    # Table list, structure and counts come from the local cache when fresh
+    cache = open_metadata_cache()
+    db_key, watermark = get_db_fingerprint(conn)
+    cached = None
+    if cache is not None and not args.no_cache:
+        cached = load_cached_metadata(cache, db_key, watermark)
+
     # Get all tables
     print("\n📊 Finding all tables...")
-    tables = get_all_tables(conn)
+    if cached:
+        tables, structures, cached_counts = cached
+        print("(using cached metadata; pass --no-cache to refresh)")
+    else:
+        tables = get_all_tables(conn)
+        structures = get_all_table_structures(conn, tables)
+        cached_counts = {}
     print(f"Found {len(tables)} tables:")
     for i, table in enumerate(tables, 1):
         print(f"  {i}. {table}")
@@ -119,6 +335,18 @@ def main():
     print("DETAILED TABLE ANALYSIS")
     print("=" * 80)
 
+    # Work out date columns and fetch all date ranges up front
+    date_columns = ['period', 'period_date', 'period_month', 'timestamp', 'created_at']
+    table_date_columns = {}
+    for table, columns in structures.items():
+        column_names = {col[0] for col in columns}
+        for date_col in date_columns:
+            if date_col in column_names:
+                table_date_columns[table] = date_col
+                break
+    date_ranges = get_all_date_ranges(conn, table_date_columns)
+    prepare_statements(conn)
+
     # Analyze each table
     all_data_info = {}
     for table in tables:
@@ -126,37 +354,36 @@ def main():
         print("-" * 40)
 
         # Get structure
-        columns = get_table_structure(conn, table)
+        columns = structures[table]
         print("Columns:")
         for col_name, data_type, max_len, nullable in columns:
             nullable_str = "" if nullable == 'YES' else " NOT NULL"
             print(f"  - {col_name}: {data_type}{nullable_str}")
 
         # Get sample data
-        count, sample_df = get_table_sample(conn, table, 5)
-        print(f"\nRow count: {count:,}")
+        count, sample_columns, sample_rows = get_table_sample(
+            conn, table, 5, prepared=True, count=cached_counts.get(table)
+        )
+        print(f"\nRow count: ≈{count:,}")
 
         if count > 0:
             print("\nSample data (first 5 rows):")
-            print(sample_df.to_string())
-
-            # Check for date columns and get date range
-            date_columns = ['period', 'period_date', 'period_month', 'timestamp', 'created_at']
-            for date_col in date_columns:
-                if date_col in sample_df.columns:
-                    min_date, max_date, unique_days = get_date_range(conn, table, date_col)
-                    if min_date:
-                        print(f"\nDate range ({date_col}):")
-                        print(f"  From: {min_date}")
-                        print(f"  To: {max_date}")
-                        print(f"  Unique days: {unique_days}")
-                    break
+            print_rows(sample_columns, sample_rows)
+
+            # Date range from the batched lookup
+            if table in date_ranges:
+                min_date, max_date, unique_days = date_ranges[table]
+                if min_date:
+                    print(f"\nDate range ({table_date_columns[table]}):")
+                    print(f"  From: {min_date}")
+                    print(f"  To: {max_date}")
+                    print(f"  Unique days: {unique_days}")
 
         # Store info for summary
         all_data_info[table] = {
             'count': count,
             'columns': [col[0] for col in columns],
-            'sample': sample_df.head(3).to_dict('records') if count > 0 else []
+            'sample': [dict(zip(sample_columns, row)) for row in sample_rows[:3]] if count > 0 else []
         }
 
     print("\n" + "=" * 80)
@@ -176,7 +403,7 @@ def main():
         if table_name in tables:
             count = all_data_info[table_name]['count']
             print(f"\n✅ {table_name}: {description}")
-            print(f"   Records: {count:,}")
+            print(f"   Records: ≈{count:,}")
             if count > 0:
                 print(f"   Columns: {', '.join(all_data_info[table_name]['columns'][:5])}")
         else:
@@ -203,8 +430,7 @@ def main():
         LIMIT 10;
         """
         print("\nTop Arizona interchange connections:")
-        az_df = pd.read_sql_query(query, conn)
-        print(az_df.to_string())
+        copy_to_stdout(conn, query)
 
     if 'eia_az_price' in tables:
         query = """
@@ -219,15 +445,14 @@ def main():
         ORDER BY sectorid;
         """
         print("\nArizona electricity prices by sector:")
-        price_df = pd.read_sql_query(query, conn)
-        print(price_df.to_string())
+        copy_to_stdout(conn, query)
 
     print("\n" + "=" * 80)
     print("SUMMARY")
     print("=" * 80)
 
     total_records = sum(info['count'] for info in all_data_info.values())
-    print(f"\n📊 Total records across all tables: {total_records:,}")
+    print(f"\n📊 Total records across all tables: ≈{total_records:,}")
     print(f"📋 Total tables: {len(tables)}")
 
     # Identify what data is available for optimization
@@ -239,8 +464,17 @@ def main():
     if 'water_price_index' in tables and all_data_info['water_price_index']['count'] > 0:
         print("  ✅ Water price data")
 
-    # Close connection
-    conn.close()
+    if cache is not None:
+        if not cached:
+            save_cached_metadata(
+                cache, db_key, watermark, structures,
+                {table: info['count'] for table, info in all_data_info.items()}
+            )
+        cache.close()
+
+    # Return connection to the pool
+    deallocate_statements(conn)
+    pool.putconn(conn)
 
     print("\n✅ Analysis complete!")
     print("\nNext steps:")
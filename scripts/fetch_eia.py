@@ -2,17 +2,125 @@
 import os
 import sys
 import argparse
+import heapq
 import json
-from datetime import datetime, timedelta
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import groupby
 
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 load_dotenv()
 
 BASE_URL = "https://api.eia.gov/v2/electricity/rto/interchange-data/data/"
 PAGE_SIZE = 5000  # EIA v2 max per request
 AZ_BAS = ["AZPS", "SRP", "TEPC"]
+MAX_WORKERS = 8  # concurrent page requests per dimension
+POOL_SIZE = 16  # kept connections; covers both dimensions at MAX_WORKERS
+
+
+class EIAFetchError(RuntimeError):
+    """A page request failed, or the fetch was cancelled after another page failed."""
+
+
+def dumps_records(records, pretty: bool = False) -> bytes:
+    """Encode records as JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(records, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(records, indent=2 if pretty else None).encode()
+
+
+def _make_session():
+    """
+    Shared client so page requests reuse TCP/TLS connections.
+
+    Prefers an HTTP/2 httpx client when httpx and h2 are installed: the
+    page threads then multiplex over one TLS session. Otherwise falls back
+    to a pooled HTTP/1.1 requests.Session.
+    """
+    if HTTPX_AVAILABLE:
+        try:
+            return httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=POOL_SIZE),
+            )
+        except ImportError:
+            pass  # httpx without the h2 extra
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _make_session()
+
+
+def _base_params(
+    api_key: str,
+    start_str: str,
+    end_str: str,
+    dim: str,
+    state: str | None = None,
+) -> tuple[tuple[str, object], ...]:
+    """Query parameters shared by every page of a `dim` fetch."""
+    params = [
+        ("api_key", api_key),
+        ("frequency", "hourly"),
+        ("data[0]", "value"),
+        ("start", start_str),
+        ("end", end_str),
+        ("sort[0][column]", "period"),
+        ("sort[0][direction]", "asc"),
+        ("length", PAGE_SIZE),
+    ]
+
+    if state:
+        params.append(("facets[state][]", state))
+
+    params.extend((f"facets[{dim}][]", ba) for ba in AZ_BAS)
+    return tuple(params)
+
+
+def _fetch_page(base_params: tuple, dim: str, offset: int) -> dict:
+    """Fetch one page of `dim` records starting at `offset` and return the JSON body."""
+    params = base_params + (("offset", offset),)
+
+    try:
+        resp = SESSION.get(BASE_URL, params=params, timeout=20)
+        resp.raise_for_status()
+    except Exception as e:
+        print(f"[fetch_eia] Request error ({dim}, offset={offset}): {e}")
+        raise EIAFetchError(f"{dim} page at offset {offset} failed: {e}") from e
+
+    return orjson.loads(resp.content) if ORJSON_AVAILABLE else resp.json()
+
+
+def _page_records(data) -> list[dict] | None:
+    if isinstance(data, dict):
+        return (
+            data.get("response", {}).get("data")
+            or data.get("data")
+            or data.get("results")
+        )
+    return None
 
 
 def _fetch_for_dimension(
@@ -21,76 +129,92 @@ def _fetch_for_dimension(
     end_str: str,
     dim: str,
     state: str | None = None,
+    on_page: Callable[[list[dict]], None] | None = None,
+    stop: threading.Event | None = None,
 ) -> list[dict]:
     """
     Fetch all pages where `dim` (either 'fromba' or 'toba') is one of AZ_BAS.
+
+    The first page reports the total row count, so the remaining offsets are
+    fetched concurrently. If the total is missing, pages are walked one by one.
+    When `on_page` is given each page is handed to it instead of being kept,
+    and the returned list is empty. Setting `stop` makes the remaining page
+    requests raise EIAFetchError instead of going out.
     """
+    base_params = _base_params(api_key, start_str, end_str, dim, state)
     all_records: list[dict] = []
+    fetched = 0
     offset = 0
     page = 1
 
-    while True:
-        print(f"[fetch_eia] ---- {dim.upper()} Page {page} (offset={offset}) ----")
+    def collect(page: int, records: list[dict]):
+        nonlocal fetched
+        fetched += len(records)
+        if on_page is None:
+            all_records.extend(records)
+        else:
+            on_page(records)
+        print(
+            f"[fetch_eia] {dim.upper()} Page {page}: fetched {len(records)} rows "
+            f"(period {records[0].get('period')} → {records[-1].get('period')}), "
+            f"total for {dim} so far = {fetched}"
+        )
+        sys.stdout.flush()
 
-        params = [
-            ("api_key", api_key),
-            ("frequency", "hourly"),
-            ("data[0]", "value"),
-            ("start", start_str),
-            ("end", end_str),
-            ("sort[0][column]", "period"),
-            ("sort[0][direction]", "asc"),
-            ("offset", offset),
-            ("length", PAGE_SIZE),
-        ]
+    print(f"[fetch_eia] ---- {dim.upper()} Page {page} (offset={offset}) ----")
+    data = _fetch_page(base_params, dim, offset)
+    records = _page_records(data)
 
-        if state:
-            params.append(("facets[state][]", state))
+    if not records:
+        print(f"[fetch_eia] No records returned on first page for {dim}.")
+        print(json.dumps(data, indent=2))
+        return all_records
 
-        for ba in AZ_BAS:
-            params.append((f"facets[{dim}][]", ba))
+    collect(page, records)
 
-        try:
-            resp = requests.get(BASE_URL, params=params, timeout=20)
-            resp.raise_for_status()
-        except Exception as e:
-            print(f"[fetch_eia] Request error ({dim}, offset={offset}): {e}")
-            sys.exit(1)
-
-        data = resp.json()
-
-        records = None
-        if isinstance(data, dict):
-            records = (
-                data.get("response", {}).get("data")
-                or data.get("data")
-                or data.get("results")
-            )
+    if len(records) < PAGE_SIZE:
+        print(
+            f"[fetch_eia] Last page for {dim} had fewer than PAGE_SIZE rows, "
+            "stopping pagination."
+        )
+        return all_records
+
+    total = data.get("response", {}).get("total")
+    if total is not None:
+        offsets = range(PAGE_SIZE, int(total), PAGE_SIZE)
+        print(f"[fetch_eia] {dim.upper()}: {total} rows total, fetching {len(offsets)} more page(s)")
+        def fetch(off: int) -> list[dict] | None:
+            if stop is not None and stop.is_set():
+                raise EIAFetchError(f"{dim} fetch cancelled")
+            return _page_records(_fetch_page(base_params, dim, off))
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            pages = executor.map(fetch, offsets)
+            try:
+                for page, records in enumerate(pages, start=2):
+                    if not records:
+                        break
+                    collect(page, records)
+            except BaseException:
+                # Fail fast: drop the queued pages instead of waiting on them
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        return all_records
+
+    while True:
+        offset += PAGE_SIZE
+        page += 1
+        print(f"[fetch_eia] ---- {dim.upper()} Page {page} (offset={offset}) ----")
 
+        records = _page_records(_fetch_page(base_params, dim, offset))
         if not records:
-            if offset == 0:
-                print(f"[fetch_eia] No records returned on first page for {dim}.")
-                print(json.dumps(data, indent=2))
-            else:
-                print(
-                    f"[fetch_eia] No records returned at offset {offset} for {dim}, "
-                    "stopping pagination."
-                )
+            print(
+                f"[fetch_eia] No records returned at offset {offset} for {dim}, "
+                "stopping pagination."
+            )
             break
 
-        first_period = records[0].get("period")
-        last_period = records[-1].get("period")
-        prev_total = len(all_records)
-        page_count = len(records)
-        new_total = prev_total + page_count
-
-        print(
-            f"[fetch_eia] {dim.upper()} Page {page}: fetched {page_count} rows "
-            f"(period {first_period} → {last_period}), total for {dim} so far = {new_total}"
-        )
-        sys.stdout.flush()
-
-        all_records.extend(records)
+        collect(page, records)
 
         if len(records) < PAGE_SIZE:
             print(
@@ -99,19 +223,14 @@ def _fetch_for_dimension(
             )
             break
 
-        offset += PAGE_SIZE
-        page += 1
-
     return all_records
 
 
-def fetch_period(
-    api_key: str,
-    start_date: str,
-    days: int = 7,
-    state: str | None = None,
-    pretty: bool = False,
-):
+def _record_key(r: dict) -> tuple[str, str, str]:
+    return (r.get("period") or "", r.get("fromba") or "", r.get("toba") or "")
+
+
+def _period_bounds(start_date: str, days: int) -> tuple[str, str]:
     try:
         start = datetime.strptime(start_date, "%Y-%m-%d").date()
     except ValueError:
@@ -129,40 +248,66 @@ def fetch_period(
     print(f"[fetch_eia] Requesting AZ-related data from {start_str} to {end_str}")
     expected = 24 * days
     print(f"[fetch_eia] Expected ~{expected} hourly timestamps for {days} day(s)")
+    return start_str, end_str
 
-    # Fetch where AZ BAs appear as FROM
-    from_records = _fetch_for_dimension(
-        api_key=api_key,
-        start_str=start_str,
-        end_str=end_str,
-        dim="fromba",
-        state=state,
-    )
 
-    # Fetch where AZ BAs appear as TO
-    to_records = _fetch_for_dimension(
-        api_key=api_key,
-        start_str=start_str,
-        end_str=end_str,
-        dim="toba",
-        state=state,
-    )
+def _fetch_both_dimensions(
+    api_key: str,
+    start_str: str,
+    end_str: str,
+    state: str | None = None,
+    on_page: Callable[[list[dict]], None] | None = None,
+) -> tuple[list[dict], list[dict]]:
+    # A failure on either side stops the other side's remaining pages
+    stop = threading.Event()
+
+    def fetch_dimension(dim: str) -> list[dict]:
+        try:
+            return _fetch_for_dimension(
+                api_key=api_key,
+                start_str=start_str,
+                end_str=end_str,
+                dim=dim,
+                state=state,
+                on_page=on_page,
+                stop=stop,
+            )
+        except BaseException:
+            stop.set()
+            raise
+
+    # Fetch where AZ BAs appear as FROM and as TO, concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        from_future, to_future = (
+            executor.submit(fetch_dimension, dim) for dim in ("fromba", "toba")
+        )
+        return from_future.result(), to_future.result()
+
+
+def fetch_period(
+    api_key: str,
+    start_date: str,
+    days: int = 7,
+    state: str | None = None,
+    pretty: bool = False,
+):
+    start_str, end_str = _period_bounds(start_date, days)
+    from_records, to_records = _fetch_both_dimensions(api_key, start_str, end_str, state)
 
     print(
         f"[fetch_eia] Raw counts before dedupe: "
         f"fromba-side={len(from_records)}, toba-side={len(to_records)}"
     )
 
-    # Merge and dedupe on (period, fromba, toba)
-    combined: list[dict] = []
-    seen: set[tuple[str | None, str | None, str | None]] = set()
-
-    for r in from_records + to_records:
-        key = (r.get("period"), r.get("fromba"), r.get("toba"))
-        if key in seen:
-            continue
-        seen.add(key)
-        combined.append(r)
+    # Merge and dedupe on (period, fromba, toba). Each side comes back sorted by
+    # period, so sorting on the full key is nearly free; a k-way merge then puts
+    # duplicates next to each other and groupby keeps the first of each run.
+    from_records.sort(key=_record_key)
+    to_records.sort(key=_record_key)
+    combined: list[dict] = [
+        next(group)
+        for _, group in groupby(heapq.merge(from_records, to_records, key=_record_key), key=_record_key)
+    ]
 
     if not combined:
         print("[fetch_eia] No AZ-related records after merge/dedupe.")
@@ -176,18 +321,115 @@ def fetch_period(
     )
 
     if pretty:
-        print(json.dumps(combined, indent=2))
+        print(dumps_records(combined, pretty=True).decode())
 
     return combined
 
 
+class _JsonArrayWriter:
+    """
+    Append deduped records to an open binary file as one JSON array.
+
+    Pages from both dimensions arrive on worker threads, so writes and the
+    (period, fromba, toba) dedupe set are guarded by a lock. Only the keys
+    are kept in memory, not the records, and each key is packed into a
+    single int: hours since 0001-01-01 in the high bits and a small id per
+    BA code in the low bits.
+    """
+
+    BA_BITS = 10  # up to 1024 distinct BA codes per run
+
+    def __init__(self, f, pretty: bool = False):
+        self._f = f
+        self._pretty = pretty
+        self._lock = threading.Lock()
+        self._ba_ids: dict[str | None, int] = {}
+        self.seen: set[int | tuple] = set()
+        self.raw_count = 0
+        self.count = 0
+        self._f.write(b"[")
+
+    def _key(self, r: dict) -> int | tuple:
+        period = r.get("period")
+        try:
+            hour = date.fromisoformat(period[:10]).toordinal() * 24 + int(period[11:13] or 0)
+        except (TypeError, ValueError):
+            # Unexpected period format: fall back to the plain tuple key
+            return (period, r.get("fromba"), r.get("toba"))
+        ba_ids = self._ba_ids
+        from_id = ba_ids.setdefault(r.get("fromba"), len(ba_ids))
+        to_id = ba_ids.setdefault(r.get("toba"), len(ba_ids))
+        if max(from_id, to_id) >> self.BA_BITS:
+            return (period, r.get("fromba"), r.get("toba"))
+        return (hour << (2 * self.BA_BITS)) | (from_id << self.BA_BITS) | to_id
+
+    def write_page(self, records: list[dict]) -> None:
+        with self._lock:
+            self.raw_count += len(records)
+            seen = self.seen
+            seen_add = seen.add
+            key_of = self._key
+            write = self._f.write
+            pretty = self._pretty
+            for r in records:
+                key = key_of(r)
+                if key in seen:
+                    continue
+                seen_add(key)
+                write(b",\n" if self.count else b"\n")
+                if pretty:
+                    # Indent each record one level, as inside an indented array
+                    write(b"  " + dumps_records(r, pretty=True).replace(b"\n", b"\n  "))
+                else:
+                    write(dumps_records(r))
+                self.count += 1
+
+    def close(self) -> None:
+        self._f.write(b"\n]\n" if self.count else b"]\n")
+
+
+def fetch_period_to_file(
+    api_key: str,
+    start_date: str,
+    path: str,
+    days: int = 7,
+    state: str | None = None,
+    pretty: bool = False,
+) -> int:
+    """
+    Like fetch_period, but streams unique records straight into a JSON array
+    file at `path` as pages arrive. Returns the number of records written.
+    The file is written under a temporary name and only replaces `path` once
+    every page has arrived, so a failed fetch leaves the previous file intact.
+    """
+    start_str, end_str = _period_bounds(start_date, days)
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            writer = _JsonArrayWriter(f, pretty=pretty)
+            _fetch_both_dimensions(api_key, start_str, end_str, state, on_page=writer.write_page)
+            writer.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    print(
+        f"[fetch_eia] DONE: wrote {writer.count} unique AZ-related rows "
+        f"({writer.raw_count} before dedupe)"
+    )
+    return writer.count
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fetch EIA hourly grid data for a date range.")
     parser.add_argument("--api-key", help="EIA API key or set EIA_API_KEY")
     parser.add_argument("--start-date", required=True, help="Start date YYYY-MM-DD")
     parser.add_argument("--days", type=int, default=7, help="Number of days to fetch (default 7)")
     parser.add_argument("--state", help="Optional state facet")
-    parser.add_argument("--save", help="Save JSON output to file")
+    parser.add_argument("--save", help="Stream records to file as a JSON array")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON")
 
     args = parser.parse_args()
@@ -197,6 +439,18 @@ def main():
         print("Error: Missing API key. Provide --api-key or set EIA_API_KEY in .env")
         sys.exit(1)
 
+    if args.save:
+        count = fetch_period_to_file(
+            api_key=api_key,
+            start_date=args.start_date,
+            path=args.save,
+            days=args.days,
+            state=args.state,
+            pretty=args.pretty,
+        )
+        print(f"Saved {count} records to {args.save}")
+        return
+
     records = fetch_period(
         api_key=api_key,
         start_date=args.start_date,
@@ -204,14 +458,12 @@ def main():
         state=args.state,
         pretty=args.pretty,
     )
-
-    if args.save:
-        with open(args.save, "w") as f:
-            json.dump(records, f, indent=2 if args.pretty else None)
-        print(f"Saved {len(records)} records to {args.save}")
-    else:
-        print(json.dumps(records, indent=2 if args.pretty else None))
+    print(dumps_records(records, pretty=args.pretty).decode())
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except EIAFetchError:
+        # The failing request was already reported
+        sys.exit(1)
@@ -8,6 +8,12 @@ import requests
 from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Reuse DB connection from your existing script
 # Ensure repo root is on sys.path so `data` package imports work when running scripts
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -42,9 +48,16 @@ def month_range(start: datetime, days: int):
     return sorted(months)
 
 
-def fetch_az_prices(api_key: str) -> list[dict]:
+def fetch_az_prices(
+    api_key: str,
+    start_month: str | None = None,
+    end_month: str | None = None,
+) -> list[dict]:
     """
-    Fetch ALL AZ price data (only monthly available).
+    Fetch AZ price data (only monthly available).
+
+    When start_month/end_month (YYYY-MM) are given the window is applied by
+    the API, so only the pages covering those months are requested.
     """
     all_records: list[dict] = []
     offset = 0
@@ -63,9 +76,14 @@ def fetch_az_prices(api_key: str) -> list[dict]:
             ("length", PAGE_SIZE),
         ]
 
+        if start_month:
+            params.append(("start", start_month))
+        if end_month:
+            params.append(("end", end_month))
+
         resp = requests.get(PRICE_URL, params=params, timeout=20)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content) if ORJSON_AVAILABLE else resp.json()
 
         records = (
             data.get("response", {}).get("data")
@@ -162,13 +180,14 @@ def main():
 
     months_needed = month_range(start, args.days)
 
-    # Fetch all AZ price data
-    all_price_rows = fetch_az_prices(api_key)
+    # Fetch AZ price data for the window only
+    all_price_rows = fetch_az_prices(api_key, months_needed[0], months_needed[-1])
 
     # Filter to only the months inside user's range
+    wanted = set(months_needed)
     filtered = [
         r for r in all_price_rows
-        if r["period"] in months_needed
+        if r["period"] in wanted
     ]
 
     print(f"[fetch_prices] Filtered to {len(filtered)} rows for months: {months_needed}")
@@ -2,25 +2,37 @@
 import os
 import sys
 import argparse
+import csv
+import io
 import json
 from datetime import datetime, timedelta
 
 import requests
+from psycopg2.errors import UndefinedTable
 from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
-# Make repo root importable so we can reuse connect_db()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Make repo root importable so we can reuse the shared connection pool
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
-from data.api.store_to_postgres import connect_db
+from data.api.store_to_postgres import get_conn
 
 load_dotenv()
 
 BLS_URL = os.getenv("BLS_API_URL", "https://api.bls.gov/publicAPI/v2/timeseries/data/")
 BLS_SERIES = os.getenv("BLS_WATER_SERIES", "CUUR0000SEHG")
 BLS_KEY = os.getenv("BLS_API_KEY")
+BULK_THRESHOLD = 500  # above this many rows, load through COPY instead of execute_values
+# Monthly BLS periods; M13 is the annual average and is skipped
+MONTHLY_PERIODS = {f"M{month:02d}" for month in range(1, 13)}
 
 
 def fetch_water_index(start_date_str: str, days: int) -> list[dict]:
@@ -43,7 +55,7 @@ def fetch_water_index(start_date_str: str, days: int) -> list[dict]:
 
     resp = requests.post(BLS_URL, headers=headers, data=json.dumps(payload))
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content) if ORJSON_AVAILABLE else resp.json()
 
     status = data.get("status")
     if status != "REQUEST_SUCCEEDED":
@@ -56,25 +68,25 @@ def fetch_water_index(start_date_str: str, days: int) -> list[dict]:
     series = series_list[0]
     series_id = series.get("seriesID", BLS_SERIES)
 
+    items = series.get("data", [])
+    if not items:
+        return []
+
     records: list[dict] = []
 
-    for item in series.get("data", []):
+    for item in items:
         period = item.get("period")
-        if not period or not period.startswith("M"):
+        if period not in MONTHLY_PERIODS:
             continue
 
-        year = int(item["year"])
-        month = int(period[1:])
-        period_date = datetime(year, month, 1).date()
-
+        period_date = datetime(int(item["year"]), int(period[1:]), 1).date()
         if period_date < start_date or period_date > end_date:
             continue
 
-        value = float(item["value"])
         records.append(
             {
                 "period_date": period_date,
-                "cpi_value": value,
+                "cpi_value": float(item["value"]),
                 "series_id": series_id,
             }
         )
@@ -82,7 +94,47 @@ def fetch_water_index(start_date_str: str, days: int) -> list[dict]:
     return records
 
 
-def save_water_index(records: list[dict], no_db: bool = False) -> None:
+def _copy_upsert(cur, rows: list[tuple]) -> None:
+    """Load rows through COPY into a staging table, then merge with one upsert."""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+
+    cur.execute(
+        """
+        CREATE TEMP TABLE water_price_index_stg
+            (LIKE water_price_index INCLUDING DEFAULTS)
+            ON COMMIT DROP
+        """
+    )
+    cur.copy_expert(
+        "COPY water_price_index_stg (period_date, cpi_value, series_id) FROM STDIN WITH CSV",
+        buf,
+    )
+    cur.execute(
+        """
+        INSERT INTO water_price_index (period_date, cpi_value, series_id)
+        SELECT period_date, cpi_value, series_id FROM water_price_index_stg
+        ON CONFLICT (period_date) DO UPDATE
+        SET cpi_value = EXCLUDED.cpi_value,
+            series_id = EXCLUDED.series_id
+        """
+    )
+
+
+def save_water_index(
+    records: list[dict],
+    no_db: bool = False,
+    bulk: bool = False,
+    reload: bool = False,
+) -> None:
+    """
+    Upsert records into water_price_index (created by scripts/create_tables.sql).
+
+    Months already stored with the same value are skipped unless `reload`
+    is set, so a routine daily run that finds nothing new writes nothing,
+    while backfills and BLS revisions are still written.
+    """
     if not records:
         print("[fetch_water_index] No records to save.")
         return
@@ -91,37 +143,53 @@ def save_water_index(records: list[dict], no_db: bool = False) -> None:
         print("[fetch_water_index] --no-db set, skipping database insert.")
         return
 
-    conn = connect_db()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS water_price_index (
-            period_date date PRIMARY KEY,
-            cpi_value numeric NOT NULL,
-            series_id text NOT NULL
-        )
-        """
-    )
-    conn.commit()
-
     rows = [
         (r["period_date"], r["cpi_value"], r["series_id"])
         for r in records
     ]
 
-    insert_sql = """
-        INSERT INTO water_price_index (period_date, cpi_value, series_id)
-        VALUES %s
-        ON CONFLICT (period_date) DO UPDATE
-        SET cpi_value = EXCLUDED.cpi_value,
-            series_id = EXCLUDED.series_id
-    """
-
-    execute_values(cur, insert_sql, rows)
-    conn.commit()
-    cur.close()
-    conn.close()
+    with get_conn() as conn:
+        cur = conn.cursor()
+
+        if not reload:
+            dates = [row[0] for row in rows]
+            try:
+                cur.execute(
+                    """
+                    SELECT period_date, cpi_value::float8
+                    FROM water_price_index
+                    WHERE period_date BETWEEN %s AND %s
+                    """,
+                    (min(dates), max(dates)),
+                )
+            except UndefinedTable:
+                print(
+                    "[fetch_water_index] water_price_index does not exist; "
+                    "run scripts/create_tables.sql first."
+                )
+                raise
+            stored = set(cur.fetchall())
+            rows = [row for row in rows if (row[0], row[1]) not in stored]
+
+            if not rows:
+                cur.close()
+                print("[fetch_water_index] All fetched months are already stored; nothing to insert.")
+                return
+
+        if bulk or len(rows) > BULK_THRESHOLD:
+            _copy_upsert(cur, rows)
+        else:
+            insert_sql = """
+                INSERT INTO water_price_index (period_date, cpi_value, series_id)
+                VALUES %s
+                ON CONFLICT (period_date) DO UPDATE
+                SET cpi_value = EXCLUDED.cpi_value,
+                    series_id = EXCLUDED.series_id
+            """
+
+            execute_values(cur, insert_sql, rows)
+        conn.commit()
+        cur.close()
 
     print(f"[fetch_water_index] Inserted/updated {len(rows)} rows into water_price_index.")
 
@@ -134,15 +202,21 @@ def main():
     parser.add_argument("--days", type=int, default=365, help="Number of days to cover")
     parser.add_argument("--pretty", action="store_true")
     parser.add_argument("--no-db", action="store_true")
+    parser.add_argument("--bulk", action="store_true", help="Load through COPY regardless of row count")
+    parser.add_argument("--reload", action="store_true", help="Rewrite months even when the stored value is unchanged")
 
     args = parser.parse_args()
 
     records = fetch_water_index(args.start_date, args.days)
 
     if args.pretty:
-        print(json.dumps(records, default=str, indent=2))
+        if ORJSON_AVAILABLE:
+            # orjson encodes the period_date values natively
+            print(orjson.dumps(records, option=orjson.OPT_INDENT_2).decode())
+        else:
+            print(json.dumps(records, default=str, indent=2))
 
-    save_water_index(records, no_db=args.no_db)
+    save_water_index(records, no_db=args.no_db, bulk=args.bulk, reload=args.reload)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Test the EIA fetch dedupe: the streaming writer and the sorted merge"""
+
+import io
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import fetch_eia
+from scripts.fetch_eia import _JsonArrayWriter, _record_key
+
+
+def _record(period, fromba, toba, value):
+    return {"period": period, "fromba": fromba, "toba": toba, "value": value}
+
+
+def _write_pages(pages, pretty=False):
+    """Run pages through a _JsonArrayWriter and return (writer, output bytes)."""
+    buf = io.BytesIO()
+    writer = _JsonArrayWriter(buf, pretty=pretty)
+    for page in pages:
+        writer.write_page(page)
+    writer.close()
+    return writer, buf.getvalue()
+
+
+def _set_dedupe(records):
+    """The original dedupe: first record per (period, fromba, toba) wins."""
+    seen = set()
+    combined = []
+    for r in records:
+        key = (r.get("period"), r.get("fromba"), r.get("toba"))
+        if key in seen:
+            continue
+        seen.add(key)
+        combined.append(r)
+    return combined
+
+
+PAGE_1 = [
+    _record("2024-08-01T00", "AZPS", "SRP", 1),
+    _record("2024-08-01T00", "AZPS", "SRP", 2),   # duplicate within the page
+    _record("2024-08-01T01", "AZPS", "SRP", 3),
+    _record("2024-08-01T00", "SRP", "AZPS", 4),
+]
+PAGE_2 = [
+    _record("2024-08-01T01", "AZPS", "SRP", 5),   # duplicate of a page-1 row
+    _record("2024-08-01T02", "AZPS", "TEPC", 6),
+]
+
+
+def test_writer_dedupes_within_and_across_pages():
+    """Duplicates are dropped whether they share a page or not; the first one wins."""
+    writer, out = _write_pages([PAGE_1, PAGE_2])
+
+    written = json.loads(out)
+    assert written == _set_dedupe(PAGE_1 + PAGE_2)
+    assert [r["value"] for r in written] == [1, 3, 4, 6]
+    assert writer.count == 4
+    assert writer.raw_count == 6
+
+
+def test_writer_unparsable_period_uses_tuple_key():
+    """A period that isn't YYYY-MM-DDTHH falls back to the plain tuple key."""
+    buf = io.BytesIO()
+    writer = _JsonArrayWriter(buf)
+    record = _record("not-a-period", "AZPS", "SRP", 1)
+    assert writer._key(record) == ("not-a-period", "AZPS", "SRP")
+    assert isinstance(writer._key(PAGE_1[0]), int)
+
+    writer, out = _write_pages([[record, dict(record, value=2)], [PAGE_1[0]]])
+    assert [r["value"] for r in json.loads(out)] == [1, 1]
+
+
+def test_writer_pretty_matches_json_indent():
+    """--save --pretty output is laid out like json.dumps(indent=2)."""
+    _, out = _write_pages([PAGE_1, PAGE_2], pretty=True)
+    expected = json.dumps(_set_dedupe(PAGE_1 + PAGE_2), indent=2) + "\n"
+    assert out.decode() == expected
+
+    _, empty = _write_pages([], pretty=True)
+    assert json.loads(empty) == []
+
+
+def test_fetch_period_merge_matches_set_dedupe(monkeypatch):
+    """The sorted k-way merge keeps the same records as the set-based dedupe."""
+    from_records = [
+        _record("2024-08-01T00", "AZPS", "SRP", 1),
+        _record("2024-08-01T01", "AZPS", "SRP", 2),
+        _record("2024-08-01T01", "AZPS", "SRP", 3),
+        _record("2024-08-01T02", "AZPS", "WALC", 4),
+    ]
+    to_records = [
+        _record("2024-08-01T00", "AZPS", "SRP", 5),   # also seen from the fromba side
+        _record("2024-08-01T00", "WALC", "AZPS", 6),
+        _record("2024-08-01T02", "SRP", "AZPS", 7),
+    ]
+    expected = sorted(_set_dedupe(from_records + to_records), key=_record_key)
+
+    monkeypatch.setattr(
+        fetch_eia, "_fetch_both_dimensions",
+        lambda *args, **kwargs: (list(from_records), list(to_records)),
+    )
+    combined = fetch_eia.fetch_period("key", "2024-08-01", days=1)
+
+    assert combined == expected
+    assert [r["value"] for r in combined] == [1, 6, 2, 4, 7]
@@ -46,32 +46,28 @@ def test_data_fetching(interface):
 
     test_date = datetime(2024, 8, 1)  # August 1, 2024
 
-    # Test weather data
-    print("\n📊 Fetching weather data...")
+    # All three series in one database round trip
+    print("\n📦 Fetching weather, electricity and water data...")
     try:
-        temperatures = interface.fetch_weather_data(test_date, hours=24)
-        print(f"✅ Got {len(temperatures)} hours of temperature data")
-        print(f"   Range: {min(temperatures):.1f}°F - {max(temperatures):.1f}°F")
+        temperatures, prices, water_prices = interface.fetch_daily_bundle(test_date, hours=24)
     except Exception as e:
-        print(f"❌ Failed to fetch weather data: {e}")
+        print(f"❌ Failed to fetch daily data: {e}")
+        return None, None
+
+    # Test weather data
+    print("\n📊 Weather data...")
+    print(f"✅ Got {len(temperatures)} hours of temperature data")
+    print(f"   Range: {min(temperatures):.1f}°F - {max(temperatures):.1f}°F")
 
     # Test electricity prices
-    print("\n💡 Fetching electricity prices...")
-    try:
-        prices = interface.get_electricity_prices(test_date, hours=24)
-        print(f"✅ Got {len(prices)} hours of price data")
-        print(f"   Range: ${min(prices):.2f} - ${max(prices):.2f}/MWh")
-        print(f"   Average: ${sum(prices)/len(prices):.2f}/MWh")
-    except Exception as e:
-        print(f"❌ Failed to fetch electricity prices: {e}")
+    print("\n💡 Electricity prices...")
+    print(f"✅ Got {len(prices)} hours of price data")
+    print(f"   Range: ${min(prices):.2f} - ${max(prices):.2f}/MWh")
+    print(f"   Average: ${sum(prices)/len(prices):.2f}/MWh")
 
     # Test water prices
-    print("\n💧 Fetching water prices...")
-    try:
-        water_prices = interface.get_water_prices(test_date)
-        print(f"✅ Got water price: ${water_prices[0]:.2f}/1000 gallons")
-    except Exception as e:
-        print(f"❌ Failed to fetch water prices: {e}")
+    print("\n💧 Water prices...")
+    print(f"✅ Got water price: ${water_prices[0]:.2f}/1000 gallons")
 
     return temperatures, prices
 
@@ -143,12 +139,17 @@ def test_history_retrieval(interface):
 
     try:
         # Get recent runs
-        history_df = interface.get_optimization_history(limit=5)
+        history_df = interface.get_optimization_history(
+            limit=5, columns=['run_timestamp', 'cost_savings', 'cost_savings_percent']
+        )
         if not history_df.empty:
             print(f"✅ Retrieved {len(history_df)} recent optimization runs")
             print("\nRecent runs:")
-            for _, row in history_df.iterrows():
-                print(f"   {row['run_timestamp']}: ${row['cost_savings']:.2f} saved ({row['cost_savings_percent']:.1f}%)")
+            # Formatted column-wise; iterrows would build a Series per row
+            lines = ("   " + history_df['run_timestamp'].astype(str)
+                     + ": $" + history_df['cost_savings'].map('{:.2f}'.format)
+                     + " saved (" + history_df['cost_savings_percent'].map('{:.1f}'.format) + "%)")
+            print("\n".join(lines))
         else:
             print("ℹ️ No optimization history found (this is normal for first run)")
 
@@ -165,15 +166,15 @@ def test_history_retrieval(interface):
         print(f"❌ Error retrieving history: {e}")
 
 
-def test_integrated_system():
+def test_integrated_system(interface):
     """Test the complete integrated system."""
     print("\n" + "="*60)
     print("6. TESTING INTEGRATED SYSTEM")
     print("="*60)
 
     try:
-        # Use DataInterface for integrated test
-        data_interface = DataInterface(use_supabase=True)
+        # Use DataInterface for integrated test, on the already tested connection
+        data_interface = DataInterface(use_supabase=True, supabase=interface)
         print("✅ DataInterface initialized")
 
         # Prepare optimization data
@@ -186,8 +187,9 @@ def test_integrated_system():
         print(f"   Max Temp: {opt_data['metadata']['max_temp']:.1f}°F")
         print(f"   Avg Price: ${opt_data['metadata']['avg_price']:.2f}/MWh")
 
-        # Run optimization with Supabase
-        optimizer = LinearDataCenterOptimizer(use_supabase=True)
+        # Run optimization with Supabase, fetching and saving through the
+        # same interface instead of opening a second connection
+        optimizer = LinearDataCenterOptimizer(use_supabase=True, data_interface=data_interface)
         results = optimizer.optimize_with_supabase(
             date=datetime(2024, 8, 1),
             solver_name='highs'
@@ -230,14 +232,12 @@ def main():
     # Test 2: Data fetching
     temperatures, prices = test_data_fetching(interface)
 
-    # Test 3: Optimization
-    if temperatures and prices:
-        results = test_optimization(temperatures, prices)
-    else:
+    # Test 3: Optimization (fixed ramps if fetching returned nothing)
+    if not (temperatures and prices):
         print("\n⚠️ Using fallback data for optimization test")
-        temperatures = [95 + i for i in range(24)]
-        prices = [100 + i*5 for i in range(24)]
-        results = test_optimization(temperatures, prices)
+        temperatures = list(range(95, 119))      # 95-118°F
+        prices = list(range(100, 220, 5))        # $100-215/MWh
+    results = test_optimization(temperatures, prices)
 
     # Test 4: Save results
     if results:
@@ -247,7 +247,7 @@ def main():
     test_history_retrieval(interface)
 
     # Test 6: Full integration
-    success = test_integrated_system()
+    success = test_integrated_system(interface)
 
     # Summary
     print("\n" + "#"*60)
@@ -4,19 +4,73 @@ Interactive Dashboard for Data Center Optimization Results
 IISE Hackathon - Cooling the Cloud
 """
 
+import json
+from functools import lru_cache
+
 import plotly.graph_objs as go
-import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
-import pandas as pd
 import numpy as np
 
+# Serialize figures with orjson when it is installed; write_html spends most
+# of its time encoding the figure JSON, and plotly falls back to json otherwise
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+
+# Small integer columns are stored narrow; float columns stay float64 so
+# plotly's JSON and text labels don't pick up float32 rounding artifacts.
+# Integer columns are rounded before the cast, since solver output for a
+# binary can come back as 0.9999 and a plain cast would truncate it to 0
+COLUMN_DTYPES = {
+    'hour': np.int8,
+    'water_cooling': np.int8,
+}
+
+# Float columns are rounded this far before plotting: finer than any label,
+# hover or axis shows, and plotly's JSON then doesn't write out all 17
+# significant digits of every float64 value
+PLOT_DECIMALS = 3
+
+
+def hourly_columns(hourly_data):
+    """Return hourly data as a dict of NumPy columns.
+
+    Accepts either the optimizer's list of per-hour dicts or an already
+    columnar dict of arrays; integer columns are rounded to their dtype.
+    """
+    if isinstance(hourly_data, dict):
+        cols = {key: np.asarray(values, dtype=np.float64 if key in COLUMN_DTYPES else None)
+                for key, values in hourly_data.items()}
+    else:
+        # Explicit dtype and count: no per-column list or dtype inference pass
+        count = len(hourly_data)
+        cols = {key: np.fromiter((row[key] for row in hourly_data),
+                                 dtype=np.float64, count=count)
+                for key in hourly_data[0]}
+    for key, dtype in COLUMN_DTYPES.items():
+        if key in cols:
+            cols[key] = np.rint(cols[key]).astype(dtype)
+    return cols
+
 
 def create_dashboard_plots(results, optimization_data=None):
     """Create all dashboard plots for the optimization results."""
 
-    # Extract hourly data
-    df = pd.DataFrame(results['hourly_data'])
-    df['cooling_mode_text'] = df['water_cooling'].apply(lambda x: 'Water' if x else 'Chiller')
+    # Extract hourly data once as columns; traces get plain NumPy arrays
+    cols = {key: np.round(values, PLOT_DECIMALS) if values.dtype.kind == 'f' else values
+            for key, values in hourly_columns(results['hourly_data']).items()}
+    hours = cols['hour']
+    batch_load = cols['batch_load_mw']
+    water_cooling = cols['water_cooling']
+    temperature = cols['temperature']
+    elec_price = cols['electricity_price']
+    cooling_mode_text = np.where(water_cooling.astype(bool), 'Water', 'Chiller')
+    elec_cost = cols['electricity_cost']
+    water_cost = cols['water_cost']
 
     # Create figure with subplots
     fig = make_subplots(
@@ -48,47 +102,42 @@ def create_dashboard_plots(results, optimization_data=None):
         'price': '#8c564b'   # Brown
     }
 
+    # Traces are collected as (trace, row, col) and added in one call below,
+    # so the figure validates and appends them in a single pass
+    traces = []
+
     # 1. Load Distribution (Stacked Bar)
-    fig.add_trace(
+    traces.append((
         go.Bar(
-            x=df['hour'],
-            y=[30] * 24,  # Base load
+            x=hours,
+            y=np.full(len(hours), 30.0),  # Base load
             name='Base Load',
             marker_color=colors['base'],
             text='30 MW',
             textposition='inside',
             hovertemplate='Hour %{x}<br>Base: 30 MW<extra></extra>'
         ),
-        row=1, col=1
-    )
+        1, 1
+    ))
 
-    fig.add_trace(
+    traces.append((
         go.Bar(
-            x=df['hour'],
-            y=df['batch_load_mw'],
+            x=hours,
+            y=batch_load,
             name='Batch Load',
             marker_color=colors['batch'],
-            text=df['batch_load_mw'].round(1),
+            texttemplate='%{y:.1f}',  # formatted in the browser, no rounded copy
             textposition='outside',
             hovertemplate='Hour %{x}<br>Batch: %{y:.1f} MW<extra></extra>'
         ),
-        row=1, col=1
-    )
-
-    # Add peak hours shading
-    for h in range(15, 20):
-        fig.add_vrect(
-            x0=h-0.4, x1=h+0.4,
-            fillcolor="red", opacity=0.1,
-            layer="below", line_width=0,
-            row=1, col=1
-        )
-
-    # 2. Cooling Mode Timeline
-    fig.add_trace(
-        go.Scatter(
-            x=df['hour'],
-            y=df['water_cooling'],
+        1, 1
+    ))
+
+    # 2. Cooling Mode Timeline (WebGL)
+    traces.append((
+        go.Scattergl(
+            x=hours,
+            y=water_cooling,
             mode='lines+markers',
             name='Cooling Mode',
             line=dict(color=colors['water'], width=3, shape='hv'),
@@ -96,71 +145,74 @@ def create_dashboard_plots(results, optimization_data=None):
             fill='tozeroy',
             fillcolor='rgba(44, 160, 44, 0.3)',
             hovertemplate='Hour %{x}<br>Mode: %{text}<extra></extra>',
-            text=df['cooling_mode_text']
+            text=cooling_mode_text
         ),
-        row=1, col=2
-    )
-
-    # Add temperature overlay
-    fig.add_trace(
-        go.Scatter(
-            x=df['hour'],
-            y=(df['temperature'] - 75) / 40,  # Normalize to 0-1
+        1, 2
+    ))
+
+    # Add temperature overlay (WebGL), normalized to 0-1; not in place, since
+    # a columnar input can carry temperature as an integer array
+    temp_norm = (temperature - 75) / 40.0
+    traces.append((
+        go.Scattergl(
+            x=hours,
+            y=temp_norm,
             mode='lines',
             name='Temperature',
             line=dict(color=colors['temp'], width=2, dash='dash'),
             yaxis='y2',
-            hovertemplate='Hour %{x}<br>Temp: %{text}°F<extra></extra>',
-            text=df['temperature'].round(1)
+            hovertemplate='Hour %{x}<br>Temp: %{customdata:.1f}°F<extra></extra>',
+            customdata=temperature
         ),
-        row=1, col=2
-    )
+        1, 2
+    ))
 
     # 3. Hourly Costs (Stacked Bar)
-    fig.add_trace(
+    traces.append((
         go.Bar(
-            x=df['hour'],
-            y=df['electricity_cost'],
+            x=hours,
+            y=elec_cost,
             name='Electricity Cost',
             marker_color=colors['price'],
             hovertemplate='Hour %{x}<br>Elec: $%{y:.2f}<extra></extra>'
         ),
-        row=2, col=1
-    )
+        2, 1
+    ))
 
-    fig.add_trace(
+    traces.append((
         go.Bar(
-            x=df['hour'],
-            y=df['water_cost'],
+            x=hours,
+            y=water_cost,
             name='Water Cost',
             marker_color=colors['water'],
             hovertemplate='Hour %{x}<br>Water: $%{y:.2f}<extra></extra>'
         ),
-        row=2, col=1
-    )
-
-    # 4. Temperature vs Cooling Decision (Scatter)
-    fig.add_trace(
-        go.Scatter(
-            x=df['temperature'],
-            y=df['batch_load_mw'],
+        2, 1
+    ))
+
+    # 4. Temperature vs Cooling Decision (Scatter, WebGL)
+    traces.append((
+        go.Scattergl(
+            x=temperature,
+            y=batch_load,
             mode='markers',
             name='Load vs Temp',
             marker=dict(
-                size=df['electricity_price'] / 10,
-                color=df['water_cooling'],
+                size=elec_price / 10,
+                color=water_cooling,
                 colorscale=['red', 'blue'],
                 showscale=True,
                 colorbar=dict(title="Cooling<br>Mode", x=1.15)
             ),
-            text=[f"Hour {h}<br>Price: ${p:.0f}" for h, p in zip(df['hour'], df['electricity_price'])],
-            hovertemplate='Temp: %{x:.1f}°F<br>Load: %{y:.1f} MW<br>%{text}<extra></extra>'
+            customdata=np.column_stack((hours, elec_price)),
+            hovertemplate=('Temp: %{x:.1f}°F<br>Load: %{y:.1f} MW<br>'
+                           'Hour %{customdata[0]}<br>Price: $%{customdata[1]:.0f}<extra></extra>')
         ),
-        row=2, col=2
-    )
+        2, 2
+    ))
 
     # 5. Cost Savings Indicator
-    fig.add_trace(
+    traces.append((
         go.Indicator(
             mode="number+delta+gauge",
             value=results['savings']['daily_savings'],
@@ -181,12 +233,12 @@ def create_dashboard_plots(results, optimization_data=None):
             title={'text': "Daily Savings ($)"},
             domain={'y': [0, 1], 'x': [0, 1]}
         ),
-        row=3, col=1
-    )
+        3, 1
+    ))
 
     # 6. Environmental Impact
     water_saved_pools = results['environmental']['water_saved_gallons'] / 325851  # Olympic pool
-    fig.add_trace(
+    traces.append((
         go.Indicator(
             mode="number+gauge",
             value=water_saved_pools,
@@ -202,10 +254,16 @@ def create_dashboard_plots(results, optimization_data=None):
             title={'text': "Water Saved<br>(Olympic Pools/Year)"},
             domain={'y': [0, 1], 'x': [0, 1]}
         ),
-        row=3, col=2
+        3, 2
+    ))
+
+    fig.add_traces(
+        [trace for trace, _, _ in traces],
+        rows=[row for _, row, _ in traces],
+        cols=[col for _, _, col in traces]
     )
 
-    # Update layout
+    # Update layout and axes in one pass
     fig.update_layout(
         title={
             'text': "🌵 Cooling the Cloud - Arizona Data Center Optimization Dashboard",
@@ -217,40 +275,54 @@ def create_dashboard_plots(results, optimization_data=None):
         height=900,
         barmode='stack',
         hovermode='x unified',
-        template='plotly_white'
+        template='plotly_white',
+        uirevision='dashboard',  # keep zoom/legend state when the figure is redrawn
+        # Peak hours shading (one band across hours 15-19) on the load subplot
+        shapes=[dict(
+            type='rect',
+            xref='x', yref='y domain',
+            x0=14.6, x1=19.4, y0=0, y1=1,
+            fillcolor='red', opacity=0.1,
+            layer='below', line=dict(width=0)
+        )],
+        # Axis titles, set here rather than with one update_*axes call per
+        # subplot. Axes are numbered over the four x/y subplots in row order:
+        # (1,1), (1,2), (2,1), (2,2); the indicator row has no axes
+        xaxis_title_text="Hour of Day",
+        yaxis_title_text="Load (MW)",
+        xaxis2_title_text="Hour of Day",
+        yaxis2_title_text="Cooling Mode",
+        xaxis3_title_text="Hour of Day",
+        yaxis3_title_text="Cost ($)",
+        xaxis4_title_text="Temperature (°F)",
+        yaxis4_title_text="Batch Load (MW)"
     )
 
-    # Update axes
-    fig.update_xaxes(title_text="Hour of Day", row=1, col=1)
-    fig.update_yaxes(title_text="Load (MW)", row=1, col=1)
-
-    fig.update_xaxes(title_text="Hour of Day", row=1, col=2)
-    fig.update_yaxes(title_text="Cooling Mode", row=1, col=2)
-
-    fig.update_xaxes(title_text="Hour of Day", row=2, col=1)
-    fig.update_yaxes(title_text="Cost ($)", row=2, col=1)
+    return fig
 
-    fig.update_xaxes(title_text="Temperature (°F)", row=2, col=2)
-    fig.update_yaxes(title_text="Batch Load (MW)", row=2, col=2)
 
-    return fig
+def _summary_metrics(results):
+    """Formatted (label, value) rows shown by the summary table."""
+    return (
+        ("Daily Cost", f"${results['summary']['total_cost']:,.2f}"),
+        ("Daily Savings", f"${results['savings']['daily_savings']:,.2f}"),
+        ("Annual Savings", f"${results['savings']['annual_savings']:,.2f}"),
+        ("Savings Rate", f"{results['savings']['percentage_saved']:.1f}%"),
+        ("Peak Demand", f"{results['summary']['peak_demand_mw']:.1f} MW"),
+        ("Water Used", f"{results['environmental']['water_used_gallons']:,.0f} gal"),
+        ("Water Saved", f"{results['environmental']['water_saved_gallons']:,.0f} gal"),
+        ("Carbon Avoided", f"{results['environmental']['carbon_avoided_tons']:.3f} tons/day")
+    )
 
 
 def create_summary_table(results):
     """Create a summary table of key metrics."""
+    return _summary_table_figure(_summary_metrics(results))
 
-    metrics = [
-        ["Daily Cost", f"${results['summary']['total_cost']:,.2f}"],
-        ["Daily Savings", f"${results['savings']['daily_savings']:,.2f}"],
-        ["Annual Savings", f"${results['savings']['annual_savings']:,.2f}"],
-        ["Savings Rate", f"{results['savings']['percentage_saved']:.1f}%"],
-        ["Peak Demand", f"{results['summary']['peak_demand_mw']:.1f} MW"],
-        ["Water Used", f"{results['environmental']['water_used_gallons']:,.0f} gal"],
-        ["Water Saved", f"{results['environmental']['water_saved_gallons']:,.0f} gal"],
-        ["Carbon Avoided", f"{results['environmental']['carbon_avoided_tons']:.3f} tons/day"]
-    ]
 
-    df = pd.DataFrame(metrics, columns=['Metric', 'Value'])
+def _summary_table_figure(metrics):
+    """Build the summary table figure from formatted metric rows."""
+    labels, values = zip(*metrics)
 
     fig = go.Figure(data=[go.Table(
         header=dict(
@@ -260,7 +332,7 @@ def create_summary_table(results):
             font=dict(size=14)
         ),
         cells=dict(
-            values=[df['Metric'], df['Value']],
+            values=[list(labels), list(values)],
             fill_color='lavender',
             align='left',
             font=dict(size=12),
@@ -277,24 +349,43 @@ def create_summary_table(results):
     return fig
 
 
+# Plotly.js options for the exported HTML files
+HTML_CONFIG = {'displaylogo': False, 'responsive': True}
+
+
+def _json_default(obj):
+    """Serialize NumPy arrays/scalars in results for the cache key."""
+    return obj.tolist() if hasattr(obj, 'tolist') else str(obj)
+
+
+@lru_cache(maxsize=8)
+def _cached_dashboard(results_key):
+    """Build the main figure once per distinct results (canonical JSON key).
+
+    The returned figure is shared between calls; don't mutate it.
+    """
+    return create_dashboard_plots(json.loads(results_key))
+
+
+# The table only shows the formatted metrics, so it's keyed on those alone
+_cached_summary_table = lru_cache(maxsize=128)(_summary_table_figure)
+
+
 def save_dashboard(results, output_file='dashboard.html'):
     """Save dashboard as HTML file."""
 
-    # Create all plots
-    main_dashboard = create_dashboard_plots(results)
-    summary_table = create_summary_table(results)
-
-    # Combine into single HTML
-    from plotly.offline import plot
-    import plotly.io as pio
+    # Create all plots; unchanged results reuse the already built figures
+    results_key = json.dumps(results, sort_keys=True, default=_json_default)
+    main_dashboard = _cached_dashboard(results_key)
+    summary_table = _cached_summary_table(_summary_metrics(results))
 
     # Save main dashboard
-    main_dashboard.write_html(output_file)
+    main_dashboard.write_html(output_file, config=HTML_CONFIG)
     print(f"✅ Dashboard saved to {output_file}")
 
     # Save summary table
     summary_file = output_file.replace('.html', '_summary.html')
-    summary_table.write_html(summary_file)
+    summary_table.write_html(summary_file, config=HTML_CONFIG)
     print(f"✅ Summary saved to {summary_file}")
 
     return output_file
@@ -304,21 +395,22 @@ if __name__ == "__main__":
     # Test with sample results
     print("Testing dashboard with sample results...")
 
-    # Create sample results
+    # Create sample results, one whole-array expression per column
+    # (hourly_columns accepts columnar hourly_data as-is)
+    rng = np.random.default_rng()
+    h = np.arange(24)
+    water = ((h > 10) & (h < 20)).astype(int)
     sample_results = {
-        'hourly_data': [
-            {
-                'hour': h,
-                'batch_load_mw': 20 if h < 15 or h > 20 else 0,
-                'water_cooling': 1 if h > 10 and h < 20 else 0,
-                'total_load_mw': 50 + np.random.uniform(-5, 5),
-                'electricity_price': 150 if 15 <= h < 20 else 50,
-                'temperature': 95 + 15 * np.sin((h-5) * np.pi / 12),
-                'electricity_cost': np.random.uniform(2, 10),
-                'water_cost': np.random.uniform(0, 2) if h > 10 and h < 20 else 0
-            }
-            for h in range(24)
-        ],
+        'hourly_data': {
+            'hour': h,
+            'batch_load_mw': np.where((h < 15) | (h > 20), 20.0, 0.0),
+            'water_cooling': water,
+            'total_load_mw': 50 + rng.uniform(-5, 5, size=24),
+            'electricity_price': np.where((h >= 15) & (h < 20), 150.0, 50.0),
+            'temperature': 95 + 15 * np.sin((h - 5) * np.pi / 12),
+            'electricity_cost': rng.uniform(2, 10, size=24),
+            'water_cost': np.where(water == 1, rng.uniform(0, 2, size=24), 0.0)
+        },
         'summary': {
             'total_cost': 81.77,
             'electricity_cost': 70.50,